@@ -0,0 +1 @@
+from .alloc_benchmark import alloc_benchmark
@@ -0,0 +1,5 @@
+from . import alloc_benchmark
+
+
+if __name__ == '__main__':
+    alloc_benchmark()
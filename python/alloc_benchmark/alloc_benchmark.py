@@ -0,0 +1,60 @@
+import io
+import tracemalloc
+import numpy as np
+from contextlib import redirect_stdout
+from typing import Callable, List, Tuple
+from ..benchmark.conf_utils.get_algo import ALGO_MAP
+from ..benchmark.conf_utils.get_objective import compute_B
+from ..benchmark.objective import DemoMonotone
+from ..rng import SEED
+
+
+def measure_allocations(maximizer: Callable[[], Tuple[np.ndarray, float]]) -> Tuple[int, int, int]:
+    """
+    Run maximizer while tracing the memory allocations with tracemalloc.
+    :return: (peak traced memory, traced memory still allocated at the end,
+              number of traced memory blocks still allocated at the end), all
+              w.r.t. the start of the run
+    """
+    tracemalloc.start()
+    snapshot_start = tracemalloc.take_snapshot()
+    memory_start, _ = tracemalloc.get_traced_memory()
+
+    with redirect_stdout(io.StringIO()):
+        maximizer()
+
+    memory_end, memory_peak = tracemalloc.get_traced_memory()
+    snapshot_end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    n_blocks = sum(stat.count_diff for stat in snapshot_end.compare_to(snapshot_start, 'filename'))
+    return memory_peak - memory_start, memory_end - memory_start, n_blocks
+
+
+def alloc_benchmark(algorithms: List[str] = ['SGL-a', 'SGL-b', 'SGL-c', 'SGL-d',
+                                             'SGL-I', 'SGL-II', 'Soma-DR-I'],
+                    ns: List[int] = [100, 200],
+                    B_range: Tuple[int, int] = (1, 4)):
+    """
+    Report the memory allocated by the algorithms on random modular instances of
+    increasing size. An algorithm that allocates a candidate vector per probe has a
+    peak that grows with n, while one that steps x in place only allocates O(sample size).
+    :param algorithms: names of the algorithms to measure, see ALGO_MAP
+    :param ns: sizes of the ground set
+    :param B_range: inclusive range for the values of each entry of B
+    """
+    print(f'{"algorithm":<12}{"n":>8}{"r":>8}{"n_calls":>10}{"peak KiB":>12}'
+          f'{"retained KiB":>14}{"blocks":>8}')
+
+    for n in ns:
+        rng = np.random.default_rng(SEED)
+        r = n // 4
+        B = compute_B(rng, n, B_range)
+        f = DemoMonotone(rng, n=n, B=B, B_range=B_range)
+
+        for algorithm in algorithms:
+            f.reset()
+            maximizer = ALGO_MAP[algorithm](np.random.default_rng(SEED), f, r)
+            peak, retained, n_blocks = measure_allocations(maximizer)
+            print(f'{algorithm:<12}{n:>8}{r:>8}{f.n_calls:>10}{peak / 1024:>12.1f}'
+                  f'{retained / 1024:>14.1f}{n_blocks:>8}')
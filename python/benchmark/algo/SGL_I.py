@@ -19,39 +19,45 @@ def SGL_I(rng: np.random.Generator,
     # compute s, the sample size
     s = utils.compute_sample_size(n=f.n, r=r, eps=eps)
 
-    # the solution starts from the zero vector
-    x = np.zeros((f.n, ), dtype=int)
+    # the solution starts from the zero vector. The oracle keeps track of x and of f(x)
+    oracle = f.incremental()
+    x = oracle.x
 
-    # prev_value keeps track of the value of f(x)
-    prev_value = 0
+    # coordinates e such that x[e] < B[e]
+    active = utils.ActiveSet(np.flatnonzero(x < f.B), n=f.n)
+
+    # whether the anytime budget of f ran out
+    stopped = False
 
     for _ in range(r):
-        V = np.copy(np.where(x < f.B)[0])
-        rng.shuffle(V)
+        V = active.permutation(rng)
 
         # split list V in batches of size at most s
         batches = utils.split_list(V, s)
 
         for Q in batches:
-            Q_one = map(lambda e: utils.char_vector(f, e), Q)
+            # evaluate f(x + 1_e) for every e in Q with a single batched oracle call
+            with f.call_site('argmax'):
+                candidate_values = oracle.value_steps(Q, 1)
 
             # e \gets \argmax_{e \in Q} f(\symbf{1}_e\ |\ \symbf{x}).
             # We add to x the element e in the sample Q that increases the value of f
             # the most.
-            x, prev_value, marginal_gain = max((
-                (
-                    candidate_x := x + one_e,
-                    candidate_value := f.value(candidate_x),
-                    candidate_value - prev_value
-                ) for one_e in Q_one
-            ), key=utils.trd)
-
-            if np.sum(x) == r:
+            i = np.argmax(candidate_values)
+            oracle.commit(Q[i], 1, candidate_values[i])
+
+            if x[Q[i]] == f.B[Q[i]]:
+                active.remove(Q[i])
+
+            # return the current solution if the anytime budget of f ran out
+            stopped = f.checkpoint(oracle.value)
+
+            if np.sum(x) == r or stopped:
                 break
 
-        if np.sum(x) == r:
+        if np.sum(x) == r or stopped:
             break
 
     assert np.sum(x) <= r
     print(f'SGL-I    n={f.n}; B={f.B_range}; r={r}; norm={np.sum(x)}')
-    return x, prev_value
+    return x, oracle.value
@@ -19,50 +19,50 @@ def SGL_II(rng: np.random.Generator,
     # compute s, the sample size
     s = utils.compute_sample_size(n=f.n, r=r, eps=eps)
 
-    # the solution starts from the zero vector
-    x = np.zeros((f.n, ), dtype=int)
+    # the solution starts from the zero vector. The oracle keeps track of x and of f(x)
+    oracle = f.incremental()
+    x = oracle.x
 
-    # prev_value keeps track of the value of f(x)
-    prev_value = 0
+    # coordinates e such that x[e] < B[e]
+    active = utils.ActiveSet(np.flatnonzero(x < f.B), n=f.n)
+
+    # whether the anytime budget of f ran out
+    stopped = False
 
     for _ in range(r):
-        V = np.copy(np.where(x < f.B)[0])
-        rng.shuffle(V)
+        V = active.permutation(rng)
 
         # split list V in batches of size at most s
         batches = utils.split_list(V, s)
 
         for Q in batches:
-            # lazy list of (e, k_max), where k_max is the highest k such that
-            # f(x + k * 1_e) >= f(x) while making sure that the cardinality constraint
-            # is respected
-            e_k_max: Tuple[int, int] = [
-                (e, min(f.B[e] - x[e], r - np.sum(x)))
-                for e in Q
-            ]
-
-            # lazy list of (one_e, max_k)
-            # one_e_k_max = utils.map_fst(lambda e: utils.char_vector(f, e), e_k_max)
-            one_e_k_max = map(lambda ek: (utils.char_vector(f, ek[0]) , ek[1]), e_k_max)
+            # k_max[i] is the highest k such that f(x + k * 1_e) >= f(x) for e = Q[i],
+            # while making sure that the cardinality constraint is respected
+            k_max = np.minimum(f.B[Q] - x[Q], r - np.sum(x))
+
+            # evaluate f(x + k_max[i] * 1_{Q[i]}) for every e in Q with a single
+            # batched oracle call
+            with f.call_site('argmax'):
+                candidate_values = oracle.value_steps(Q, k_max)
 
             # We add k copies of the element in the sample q that increases the value of f
             # the most to the solution x.
-            x, prev_value, marginal_gain, k = max((
-                (
-                    candidate_x := x + k * one_e,
-                    candidate_value := f.value(candidate_x),
-                    candidate_value - prev_value,
-                    k
-                ) for one_e, k in one_e_k_max
-            ), key=utils.trd)
-
-            if np.sum(x) == r:
+            i = np.argmax(candidate_values)
+            oracle.commit(Q[i], k_max[i], candidate_values[i])
+
+            if x[Q[i]] == f.B[Q[i]]:
+                active.remove(Q[i])
+
+            # return the current solution if the anytime budget of f ran out
+            stopped = f.checkpoint(oracle.value)
+
+            if np.sum(x) == r or stopped:
                 break
 
-        if np.sum(x) == r:
+        if np.sum(x) == r or stopped:
             break
 
 
     assert np.sum(x) <= r
     print(f'SGL-II   n={f.n}; B={f.B_range}; r={r}; norm={np.sum(x)}')
-    return x, prev_value
+    return x, oracle.value
@@ -19,11 +19,12 @@ def SGL_II_b(rng: np.random.Generator,
     # compute s, the sample size
     s = utils.compute_sample_size(n=f.n, r=r, eps=eps)
 
-    # the solution starts from the zero vector
-    x = np.zeros((f.n, ), dtype=int)
+    # the solution starts from the zero vector. The oracle keeps track of x and of f(x)
+    oracle = f.incremental()
+    x = oracle.x
 
-    # prev_value keeps track of the value of f(x)
-    prev_value = 0
+    # coordinates e such that x[e] < B[e]
+    active = utils.ActiveSet(np.flatnonzero(x < f.B), n=f.n)
 
     # norm keeps track of the L-1 norm of x
     norm = 0
@@ -31,23 +32,28 @@ def SGL_II_b(rng: np.random.Generator,
     # iteration counter
     t = 0
 
-    while norm < r and t < r:
+    # whether the anytime budget of f ran out
+    stopped = False
+
+    while norm < r and t < r and not stopped:
         # random sub-sampling step
-        sample_space = np.where(x < f.B)[0]
-        Q = rng.choice(sample_space, size=min(s, len(sample_space)), replace=False)
+        Q = active.sample(rng, s)
+
+        # enumerate every (e, k) step with e in Q and k in [0, min(B[e] - x[e], r - norm)]
+        E = np.array([e for e in Q for _ in range(min(f.B[e] - x[e], r - norm) + 1)], dtype=int)
+        K = np.array([k for e in Q for k in range(min(f.B[e] - x[e], r - norm) + 1)], dtype=int)
+
+        # evaluate f(x + K[i] * 1_{E[i]}) for every step with a single batched oracle call
+        with f.call_site('argmax'):
+            candidate_values = oracle.value_steps(E, K)
 
         # We add to x the element in the sample q that increases the value of f
         # the most. k might also be 0.
-        x, prev_value, marginal_gain, k = max((
-            (
-                candidate_x := x + k * utils.char_vector(f, e),
-                candidate_value := f.value(candidate_x),
-                candidate_value - prev_value,
-                k
-            )
-            for e in Q
-            for k in range(min(f.B[e] - x[e], r - norm) + 1)
-        ), key=utils.trd)
+        i = np.argmax(candidate_values)
+        oracle.commit(E[i], K[i], candidate_values[i])
+
+        if x[E[i]] == f.B[E[i]]:
+            active.remove(E[i])
 
         # update norm
         norm = np.sum(x)
@@ -55,5 +61,8 @@ def SGL_II_b(rng: np.random.Generator,
         # increment iteration counter
         t += 1
 
+        # return the current solution if the anytime budget of f ran out
+        stopped = f.checkpoint(oracle.value)
+
     assert np.sum(x) <= r
-    return x, prev_value
+    return x, oracle.value
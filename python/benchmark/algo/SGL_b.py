@@ -6,7 +6,7 @@ from .. import utils
 
 
 def SGL_b(rng: np.random.Generator, f: Objective,
-          r: int, eps: float) -> Tuple[NDArray[int], float]:
+          r: int, eps: float, search_mode: str = 'binary') -> Tuple[NDArray[int], float]:
     """
     Randomized algorithm for integer-lattice submodular maximization of monotone functions with cardinality
     constraints in linear time.
@@ -15,15 +15,18 @@ def SGL_b(rng: np.random.Generator, f: Objective,
     :param f: integer-lattice submodular function objective
     :param r: cardinality constraint
     :param eps: non-negative error threshold
+    :param search_mode: search mode of utils.binary_search, either 'binary', 'k-ary' or 'galloping'
     """
     # compute s, the sample size
     s = utils.compute_sample_size(n=f.n, r=r, eps=eps)
 
-    # the solution starts from the zero vector
-    x = np.zeros((f.n, ), dtype=int)
+    # the solution starts from the zero vector. The incremental oracle keeps track
+    # of the solution x and of its value f(x)
+    oracle = f.incremental()
+    x = oracle.x
 
-    # prev_value keeps track of the value of f(x)
-    prev_value = 0
+    # coordinates e such that x[e] < B[e]
+    active = utils.ActiveSet(np.flatnonzero(x < f.B), n=f.n)
 
     # iteration counter
     t = 0
@@ -31,43 +34,50 @@ def SGL_b(rng: np.random.Generator, f: Objective,
     # norm keeps track of the L-1 norm of x
     norm = 0
 
-    d = max((f.value(utils.char_vector(f, e)) for e in f.V))
+    with f.call_site('singleton_scan'):
+        d = np.max(f.value_singletons())
     theta = d
     stop_theta = (eps / r) * d
 
-    while norm < r:
-        V = np.copy(np.where(x < f.B)[0])
-        rng.shuffle(V)
+    # whether the anytime budget of f ran out
+    stopped = False
+
+    while norm < r and not stopped:
+        V = active.permutation(rng)
 
         # split list V in batches of size at most s
         batches = utils.split_list(V, s)
 
         for Q in batches:
-            Q_one = list(map(lambda e: utils.char_vector(f, e), Q))
-
             # potentially add multiple copies of every item in Q
-            for i, e in enumerate(Q):
-                one_e = Q_one[i]
+            for e in Q:
+                # return the current solution if the anytime budget of f ran out
+                stopped = f.checkpoint(oracle.value)
+                if stopped:
+                    break
+
                 k_max = np.min([f.B[e] - x[e], r - norm])
                 k_range = list(range(1, k_max + 1))
 
                 # find k in k_interval maximal such that f(k * 1_e | x) >= k * theta
-                best_t = utils.binary_search(f, k_range, one_e=one_e, x=x,
-                                            prev_value=prev_value, theta=theta)
+                best_t = utils.binary_search(oracle, e, k_range, theta=theta,
+                                             mode=search_mode)
 
                 if best_t is None:
                     # print('skip\n')
                     # no feasible k was found, nothing gets added to x this iteration.
                     continue
 
-                k, candidate_x, candidate_value = best_t
+                k, candidate_value = best_t
                 # print(f'k={k} for e={e}\n')
                 
                 # We add to x the element in the sample q that increases the value of f
                 # the most, extracted k times.
-                x = candidate_x
+                oracle.commit(e, k, candidate_value)
                 norm += k
-                prev_value = candidate_value
+
+                if x[e] == f.B[e]:
+                    active.remove(e)
 
             # update theta
             theta = max(theta * (1 - eps), stop_theta)
@@ -75,9 +85,9 @@ def SGL_b(rng: np.random.Generator, f: Objective,
             # increment iteration counter
             t += 1
 
-            if norm == r:
+            if norm == r or stopped:
                 break
 
     print(f'SGL-b    t={t}; n={f.n}; B={f.B_range}; r={r}; norm={norm}')
-    assert norm == r
-    return x, prev_value
+    assert norm == r or stopped
+    return x, oracle.value
@@ -6,7 +6,8 @@ from .. import utils
 
 
 def SGL_c(rng: np.random.Generator, f: Objective,
-          r: int, eps: float) -> Tuple[NDArray[int], float]:
+          r: int, eps: float, n_workers: int = 1,
+          search_mode: str = 'binary') -> Tuple[NDArray[int], float]:
     """
     Randomized algorithm for integer-lattice submodular maximization of monotone functions with cardinality
     constraints in linear time.
@@ -15,15 +16,19 @@ def SGL_c(rng: np.random.Generator, f: Objective,
     :param f: integer-lattice submodular function objective
     :param r: cardinality constraint
     :param eps: non-negative error threshold
+    :param n_workers: number of processes that run the binary searches of each batch
+    :param search_mode: search mode of utils.binary_search, either 'binary', 'k-ary' or 'galloping'
     """
     # compute s, the sample size
     s = utils.compute_sample_size(n=f.n, r=r, eps=eps)
 
-    # the solution starts from the zero vector
-    x = np.zeros((f.n, ), dtype=int)
+    # the solution starts from the zero vector. The incremental oracle keeps track
+    # of the solution x and of its value f(x)
+    oracle = f.incremental()
+    x = oracle.x
 
-    # prev_value keeps track of the value of f(x)
-    prev_value = 0
+    # coordinates e such that x[e] < B[e]
+    active = utils.ActiveSet(np.flatnonzero(x < f.B), n=f.n)
 
     # iteration counter
     t = 0
@@ -31,57 +36,63 @@ def SGL_c(rng: np.random.Generator, f: Objective,
     # norm keeps track of the L-1 norm of x
     norm = 0
 
-    d = max((f.value(utils.char_vector(f, e)) for e in f.V))
+    with f.call_site('singleton_scan'):
+        d = np.max(f.value_singletons())
     theta = d
     stop_theta = (eps / r) * d
 
-    while norm < r:
-        V = np.copy(np.where(x < f.B)[0])
-        rng.shuffle(V)
+    # whether the anytime budget of f ran out
+    stopped = False
 
-        # split list V in batches of size at most s
-        batches = utils.split_list(V, s)
+    # the binary searches of every batch Q are fanned out to n_workers processes
+    with utils.BinarySearchPool(f, n_workers, search_mode=search_mode) as pool:
+        while norm < r and not stopped:
+            V = active.permutation(rng)
 
-        for Q in batches:
-            Q_one = list(map(lambda e: utils.char_vector(f, e), Q))
+            # split list V in batches of size at most s
+            batches = utils.split_list(V, s)
 
-            # keep track of the (k, candidate_x, candidate_value) tuples in Q
-            best_t_list = []
+            for Q in batches:
+                # potentially add multiple copies of every item in Q
+                steps = [(e, np.min([f.B[e] - x[e], r - norm])) for e in Q]
 
-            # potentially add multiple copies of every item in Q
-            for i, e in enumerate(Q):
-                one_e = Q_one[i]
-                k_max = np.min([f.B[e] - x[e], r - norm])
-                k_range = list(range(1, k_max + 1))
+                # for every e in Q, find k in k_interval maximal such that
+                # f(k * 1_e | x) >= k * theta. The searches are independent, so they
+                # may run in parallel
+                best_ts = pool.search(oracle, steps, theta=theta)
 
-                # find k in k_interval maximal such that f(k * 1_e | x) >= k * theta
-                best_t = utils.binary_search(f, k_range, one_e=one_e, x=x,
-                                            prev_value=prev_value, theta=theta)
+                # keep track of the (e, k, candidate_value) tuples in Q
+                best_t_list = [
+                    (e, *best_t)
+                    for (e, _), best_t in zip(steps, best_ts)
+                    if best_t is not None
+                ]
 
-                if best_t is not None:
-                    # print('skip\n')
-                    best_t_list.append(best_t)
+                if len(best_t_list) > 0:
+                    # select the best_t with the largest marginal gain
+                    e, k, candidate_value = max(best_t_list, key=lambda best_t: best_t[2] - oracle.value)
+                    # print(f'k={k} for e={e}\n')
 
-            if len(best_t_list) > 0:
-                # select the best_t with the largest marginal gain
-                k, candidate_x, candidate_value = max(best_t_list, key=lambda best_t: best_t[2] - prev_value)
-                # print(f'k={k} for e={e}\n')
+                    # We add to x the element in the sample q that increases the value of f
+                    # the most, extracted k times.
+                    oracle.commit(e, k, candidate_value)
+                    norm += k
 
-                # We add to x the element in the sample q that increases the value of f
-                # the most, extracted k times.
-                x = candidate_x
-                norm += k
-                prev_value = candidate_value
+                    if x[e] == f.B[e]:
+                        active.remove(e)
 
-            # update theta
-            theta = max(theta * (1 - eps), stop_theta)
+                # update theta
+                theta = max(theta * (1 - eps), stop_theta)
 
-            # increment iteration counter
-            t += 1
+                # increment iteration counter
+                t += 1
 
-            if norm == r:
-                break
+                # return the current solution if the anytime budget of f ran out
+                stopped = f.checkpoint(oracle.value)
+
+                if norm == r or stopped:
+                    break
 
     print(f'SGL-c    t={t}; n={f.n}; B={f.B_range}; r={r}; norm={norm}')
-    assert norm == r
-    return x, prev_value
+    assert norm == r or stopped
+    return x, oracle.value
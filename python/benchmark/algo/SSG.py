@@ -2,22 +2,63 @@ import numpy as np
 from typing import Tuple
 from nptyping import NDArray
 from ..objective import Objective
-from ..set_objective import SetObjective
-from ..utils import bridge
-from .. import set_algo
+from .. import utils
 
 
 def SSG(rng: np.random.Generator,
         f: Objective, r: int, eps: float) -> Tuple[NDArray[int], int]:
     """
     Simulated StochasticGreedy algorithm in the integer lattice domain.
+    It runs StochasticGreedy over the expanded ground set {0, ..., sum(B) - 1} of
+    utils.bridge.to_set_objective, where the copy i represents the element i mod n,
+    without ever materializing it: since all the copies of an element are
+    interchangeable, sampling from the expanded ground set only requires the
+    number of copies of every element that are still available.
     :param rng: numpy random generator instance
     :param f: integer-lattice submodular function objective
     :param r: cardinality constraint
     :param eps: error threshold
     """
-    f_prime: SetObjective = bridge.to_set_objective(f)
-    S, value = set_algo.stochastic_greedy(rng, f_prime, r, eps)
-    x = bridge.to_integer_lattice(f_prime, S)
+    # size of the expanded ground set
+    expanded_n = int(np.sum(f.B))
 
-    return x, value
+    # compute s, the sample size, w.r.t. the expanded ground set
+    s = utils.compute_sample_size(n=expanded_n, r=r, eps=eps)
+
+    # available[e] is the number of copies i = e, e + n, e + 2n, ... < expanded_n
+    # of e that aren't in the solution yet
+    available = (expanded_n - np.arange(f.n) + f.n - 1) // f.n
+
+    # the solution starts from the zero vector. The oracle keeps track of x and of f(x)
+    oracle = f.incremental()
+    x = oracle.x
+
+    # norm keeps track of the L-1 norm of x, i.e. of the size of the set solution
+    norm = 0
+
+    while norm < r:
+        # R is a random subset obtained by sampling s random copies from the ones
+        # that are still available, which are laid out element by element
+        available_ends = np.cumsum(available)
+        n_available = int(available_ends[-1])
+        if n_available == 0:
+            break
+
+        positions = rng.choice(n_available, size=min(s, n_available), replace=False)
+        R = np.searchsorted(available_ends, positions, side='right')
+
+        # every copy of a in R adds a single unit of a to x
+        with f.call_site('argmax'):
+            candidate_values = oracle.value_steps(R, 1)
+
+        # ties are broken in favor of the first sampled copy
+        i = np.argmax(candidate_values)
+        oracle.commit(R[i], 1, candidate_values[i])
+        available[R[i]] -= 1
+        norm += 1
+
+        # return the current solution if the anytime budget of f ran out
+        if f.checkpoint(oracle.value):
+            break
+
+    return x, oracle.value
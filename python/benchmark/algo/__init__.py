@@ -8,5 +8,9 @@ from .SGL_II import SGL_II
 from .SGL_II_b import SGL_II_b
 from .SSG import SSG
 from .soma_DR_I import soma_DR_I
+from .soma_DR_I_lazy import soma_DR_I_lazy
 from .soma_II import soma_II
 from .lai_DR import lai_DR
+from .adaptive_sequencing import adaptive_sequencing
+from .greedi import greedi
+from .sieve_streaming import sieve_streaming
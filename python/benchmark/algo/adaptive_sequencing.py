@@ -0,0 +1,108 @@
+import numpy as np
+from nptyping import NDArray
+from typing import Tuple
+from ..objective import Objective
+from .. import utils
+
+
+def adaptive_sequencing(rng: np.random.Generator, f: Objective, r: int,
+                        eps: float, n_workers: int = 1) -> Tuple[NDArray[int], float]:
+    """
+    Low-adaptivity algorithm for DR-submodular maximization of monotone functions
+    defined on the integer lattice with cardinality constraints, in the style of the
+    adaptive sequencing algorithms for set-submodular functions.
+    Every adaptive round issues a large batch of independent oracle queries, which
+    are evaluated by n_workers processes:
+    - the filter round computes f(1_e | x) for every e such that x[e] < B[e], and keeps
+      the set X of elements whose marginal gain is at least the threshold theta;
+    - every sequencing round draws a random sequence of copies of the elements in X,
+      and for every prefix x_i of length i in {1, 2, 4, ..., m} it computes the
+      marginal gains f(1_e | x_i) of the elements in X at once. The longest prefix
+      such that at least a (1 - eps) fraction of X still has marginal gain at least
+      theta is added to x, and X is restricted to those elements.
+    Hence either X shrinks geometrically or the prefix fills the budget, and theta
+    is lowered by a (1 - eps) factor only when X is empty, so that the number of
+    adaptive rounds is polylogarithmic in n and r for a constant eps.
+    :param rng: numpy random generator instance
+    :param f: integer-lattice submodular function objective
+    :param r: cardinality constraint
+    :param eps: constant error threshold
+    :param n_workers: number of processes that evaluate the queries of each round
+    """
+    # the solution starts from the zero vector. The oracle keeps track of x and of f(x)
+    oracle = f.incremental()
+    x = oracle.x
+
+    # norm keeps track of the L-1 norm of x
+    norm = 0
+
+    # number of adaptive rounds
+    t = 0
+
+    with f.call_site('singleton_scan'):
+        d = np.max(f.value_singletons())
+    theta = d
+    stop_theta = (eps / r) * d
+
+    # whether the anytime budget of f ran out
+    stopped = False
+
+    with utils.QueryPool(f, n_workers) as pool:
+        while theta >= stop_theta and norm < r and not stopped:
+            # filter round: X is the set of elements e such that f(1_e | x) >= theta
+            V = np.flatnonzero(x < f.B)
+            with f.call_site('filter'):
+                marginal_gains = pool.value_steps(oracle, V, 1) - oracle.value
+            X = V[marginal_gains >= theta]
+            t += 1
+
+            while len(X) > 0 and norm < r and not stopped:
+                # random sequence of at most r - norm copies of the elements in X
+                copies = np.repeat(X, np.minimum(f.B[X] - x[X], r - norm))
+                sequence = rng.permutation(copies)[:r - norm]
+                m = len(sequence)
+
+                # prefix lengths 1, 2, 4, ..., m
+                lengths = np.unique(np.minimum(2 ** np.arange(int(m).bit_length() + 1), m))
+
+                # x_i is x plus the first i copies of the sequence
+                prefixes = [x + np.bincount(sequence[:i], minlength=f.n).astype(x.dtype) for i in lengths]
+
+                # sequencing round: for every prefix x_i, f(x_i) and f(x_i + 1_e) for every
+                # e in X that can still be added to x_i
+                alive = [X[x_i[X] < f.B[X]] for x_i in prefixes]
+                with f.call_site('sequence'):
+                    values_list = pool.map_steps([(x_i, X_i, 1) for x_i, X_i in zip(prefixes, alive)])
+                t += 1
+
+                # the prefix to add is the longest one before the fraction of X with marginal
+                # gain at least theta drops below 1 - eps. The first copy of the sequence is
+                # always added, since it belongs to X
+                above = [X_i[values - prefix_value >= theta]
+                         for X_i, (prefix_value, values) in zip(alive, values_list)]
+                j_star = len(lengths) - 1
+                for j, X_j in enumerate(above):
+                    if len(X_j) < (1 - eps) * len(X):
+                        j_star = max(j - 1, 0)
+                        break
+
+                # add the prefix to x. Every commit is given the value of the whole prefix
+                i_star = lengths[j_star]
+                prefix_value = values_list[j_star][0]
+                steps = np.bincount(sequence[:i_star], minlength=f.n)
+                for e in np.flatnonzero(steps):
+                    oracle.commit(e, steps[e], prefix_value)
+                norm += i_star
+
+                # by DR-submodularity, the elements out of X still have marginal gain
+                # below theta, so the sequencing round already filtered X w.r.t. the new x
+                X = above[j_star]
+
+                # return the current solution if the anytime budget of f ran out
+                stopped = f.checkpoint(oracle.value)
+
+            theta = theta * (1 - eps)
+
+    print(f'AS       t={t}; n={f.n}; B={f.B_range}; r={r}; norm={norm}')
+    assert norm <= r
+    return x, oracle.value
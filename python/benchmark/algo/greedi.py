@@ -0,0 +1,137 @@
+import multiprocessing as mp
+import numpy as np
+from nptyping import NDArray
+from typing import Any, Callable, Dict, List, Tuple, Union
+from ..objective import Objective, RestrictedObjective
+from .SGL_a import SGL_a
+from .SGL_b import SGL_b
+from .SGL_I import SGL_I
+from .soma_DR_I import soma_DR_I
+from .soma_DR_I_lazy import soma_DR_I_lazy
+
+
+# algorithms that GreeDi can run on every shard and on the union of the shard solutions
+BASE_ALGO_MAP: Dict[str, Callable[[np.random.Generator, Objective, int, float], Tuple[NDArray[int], float]]] = {
+    'SGL-a': lambda rng, f, r, eps: SGL_a(rng, f, r, eps=eps),
+    'SGL-b': lambda rng, f, r, eps: SGL_b(rng, f, r, eps=eps),
+    'SGL-I': lambda rng, f, r, eps: SGL_I(rng, f, r, eps=eps),
+    'Soma-DR-I': lambda rng, f, r, eps: soma_DR_I(f, r, eps=eps),
+    'Soma-DR-I-lazy': lambda rng, f, r, eps: soma_DR_I_lazy(f, r, eps=eps),
+}
+
+
+# objective inherited by the worker processes when they are forked
+_worker_f: Objective = None
+
+
+def _init_worker(f: Objective):
+    global _worker_f
+    _worker_f = f
+
+
+def _run_shard(seed: int, coords: NDArray[int], r: int, eps: float, base: str,
+               site: Union[None, str]) -> Tuple[Tuple[NDArray[int], float, int, int], Dict[str, Any]]:
+    """
+    Run the base algorithm on f restricted to coords in a worker process, attributing
+    its oracle calls to the call site of the main process.
+    :return: the solution in the lattice domain of f, its value, and the number of oracle
+             calls and round trips performed on the shard, and the per-call-site oracle
+             metrics of the shard
+    """
+    # drop the metrics inherited from the main process
+    _worker_f._pop_site_metrics()
+
+    with _worker_f.call_site(site):
+        result = run_restricted(_worker_f, np.random.default_rng(seed), coords, r, eps, base)
+
+    return result, _worker_f._pop_site_metrics()
+
+
+def run_restricted(f: Objective, rng: np.random.Generator, coords: NDArray[int], r: int,
+                   eps: float, base: str) -> Tuple[NDArray[int], float, int, int]:
+    """
+    Run the base algorithm on f restricted to coords, under the cardinality constraint
+    r capped to the capacity of coords.
+    :return: the solution in the lattice domain of f, its value, and the number of oracle
+             calls and round trips performed
+    """
+    n_calls_start, n_rounds_start = f.n_calls, f.n_rounds
+
+    g = RestrictedObjective(f, coords)
+    y, value = BASE_ALGO_MAP[base](rng, g, min(r, int(np.sum(g.B))), eps)
+
+    return g.embed(y), value, f.n_calls - n_calls_start, f.n_rounds - n_rounds_start
+
+
+def greedi(rng: np.random.Generator, f: Objective, r: int, eps: float, n_shards: int = 4,
+           base: str = 'Soma-DR-I-lazy', n_workers: int = 1) -> Tuple[NDArray[int], float]:
+    """
+    GreeDi two-round partitioned algorithm for submodular maximization over the integer
+    lattice with cardinality constraint.
+    The ground set is randomly partitioned in n_shards shards, and the base algorithm
+    is run on f restricted to the coordinates of every shard. Then, the base algorithm
+    is run again on f restricted to the union of the supports of the shard solutions.
+    The best solution among the final one and the shard ones is returned.
+    The shards run in a pool of n_workers forked processes, which share the arrays of f
+    with the main process copy-on-write, or read-only when f is memory-mapped from the
+    instance store. The oracle calls of every shard, and their metrics if f is instrumented,
+    are added to the ones of f, and reported
+    to f as the groups 'shard_<i>' and 'union'.
+    :param rng: numpy random generator instance
+    :param f: integer-lattice submodular function objective
+    :param r: cardinality constraint
+    :param eps: non-negative error threshold of the base algorithm
+    :param n_shards: number of shards of the ground set, capped to the size of the ground set
+    :param base: name of the base algorithm, see BASE_ALGO_MAP
+    :param n_workers: number of processes that run the shards
+    """
+    # random partition of the ground set in non-empty shards, and an independent
+    # random seed for every shard
+    n_shards = min(n_shards, f.n)
+    shards: List[NDArray[int]] = [np.sort(coords) for coords in np.array_split(rng.permutation(f.n), n_shards)]
+    seeds = rng.integers(low=0, high=2**63, size=n_shards)
+
+    # first round: run the base algorithm on every shard
+    if n_workers > 1:
+        site = f.current_call_site()
+        args = [(seed, coords, r, eps, base, site) for seed, coords in zip(seeds, shards)]
+        with mp.get_context('fork').Pool(n_workers, initializer=_init_worker, initargs=(f, )) as pool:
+            results_sites = pool.starmap(_run_shard, args)
+
+        # the oracle calls of the workers are performed on their own copy of f
+        results = []
+        for result, sites in results_sites:
+            _, _, n_calls, n_rounds = result
+            f._count_calls(n_calls, n_rounds)
+            f._merge_site_metrics(sites)
+            results.append(result)
+    else:
+        results = [
+            run_restricted(f, np.random.default_rng(seed), coords, r, eps, base)
+            for seed, coords in zip(seeds, shards)
+        ]
+
+    for i, ((_, shard_value, n_calls, n_rounds), coords) in enumerate(zip(results, shards)):
+        f.record_group(f'shard_{i}', n_calls, n_rounds)
+        print(f'GreeDi   shard={i}; n={len(coords)}; value={shard_value}; n_calls={n_calls}; n_rounds={n_rounds}')
+
+    # best solution of the first round
+    x_shard, shard_value, _, _ = max(results, key=lambda result: result[1])
+
+    # second round: run the base algorithm on the union of the shard solutions, unless
+    # the anytime budget of f already ran out
+    union = np.flatnonzero(np.sum([x_shard for x_shard, _, _, _ in results], axis=0) > 0)
+    x, value = f.zeros(), 0
+
+    if len(union) > 0 and not f.checkpoint(shard_value):
+        x, value, n_calls, n_rounds = run_restricted(f, rng, union, r, eps, base)
+        f.record_group('union', n_calls, n_rounds)
+        print(f'GreeDi   union; n={len(union)}; value={value}; n_calls={n_calls}; n_rounds={n_rounds}')
+
+    # return the best solution found
+    if shard_value > value:
+        x, value = x_shard, shard_value
+
+    print(f'GreeDi   n={f.n}; B={f.B_range}; r={r}; norm={np.sum(x)}')
+    assert np.sum(x) <= r
+    return x, value
@@ -1,101 +1,123 @@
 import numpy as np
-import cvxpy as cvx
 from nptyping import NDArray
-from typing import Tuple
-from ..objective import Objective
-from .. import utils
+from typing import Callable, Tuple
+from ..objective import Objective, IncrementalOracle
 
 
-def lai_DR(rng: np.random.Generator, f: Objective, r: int) -> Tuple[NDArray[int], float]:
+def lai_DR(rng: np.random.Generator, f: Objective, r: int,
+           m_solver: str = 'greedy') -> Tuple[NDArray[int], float]:
     """
     Implement Lai'19 algorithm for maximizing a DR-submodular monotone function
     over the integer lattice under cardinality constraint.
     :param rng: numpy random generator instance
     :param f: a DR-submodular monotone function
     :param r: the cardinality constraint
+    :param m_solver: name of the solver used to find m, see M_SOLVER_MAP
     """
-    # the solution starts from the zero vector
-    x = np.zeros((f.n, ), dtype=int)
-
-    # we assume f is normalized
-    prev_value = 0
-
-    # characteristic_vectors keeps track of the characteristic vector representation
-    # of all e in f.V, assuming f.V is 0-indexed
-    characteristic_vectors = [
-      utils.char_vector(f, e)
-      for e in f.V
-    ]
+    # the solution starts from the zero vector. The oracle keeps track of x and of f(x),
+    # assuming f is normalized
+    oracle = f.incremental()
+    x = oracle.x
 
     # initialize the procedure to find m
-    find_m = argmax_m(f, r, characteristic_vectors)
+    find_m = argmax_m(f, r, M_SOLVER_MAP[m_solver])
+
+    # whether the anytime budget of f ran out
+    stopped = False
 
     for t in range(r):
         # find the optimal m w.r.t. the current x
-        m = find_m(x, prev_value)
-        
+        m = find_m(oracle)
+
         # m_norm is the L-1 norm of m
         norm_m = np.sum(m)
 
         # choose e in f.V randomly with probability m[e] / norm_m for all e in f.V
-        e = rng.choice(f.V, p=[m[e] / norm_m for e in f.V])
-        one_e = characteristic_vectors[e]
+        e = rng.choice(f.V, p=m / norm_m)
 
         # update the solution adding a single element
-        x = x + one_e
-        prev_value = f.value(x)
+        oracle.commit(e, 1, oracle.value_step(e, 1))
+
+        # return the current solution if the anytime budget of f ran out
+        stopped = f.checkpoint(oracle.value)
+        if stopped:
+            break
 
     print(f'Lai-DR     t={t}; n={f.n}; B={f.B_range}; r={r}; norm={np.sum(x)}')
-    assert np.sum(x) == r
-    return x, prev_value
+    assert np.sum(x) == r or stopped
+    return x, oracle.value
+
 
+def solve_m_greedy(gains: NDArray[float], capacity: NDArray[int], r: int) -> NDArray[int]:
+    """
+    Exactly solve max_m m @ gains s.t. sum(m) <= r, 0 <= m <= capacity, m integer.
+    Since every unit of m has the same weight in the cardinality constraint, the
+    optimum fills the capacity of the elements with the largest gains first.
+    Elements with zero gain are filled as well, so that m is non-zero whenever
+    some capacity is left.
+    :param gains: marginal gain f(e | x) of each element e
+    :param capacity: maximum number of copies of each element e, i.e. B[e] - x[e]
+    :param r: the cardinality constraint
+    """
+    m = np.zeros((len(gains), ), dtype=int)
+    candidates = np.flatnonzero((capacity > 0) & (gains >= 0))
 
+    if len(candidates) == 0:
+        return m
+
+    # every candidate has capacity at least 1, so at most r of them are needed
+    if len(candidates) > r:
+        top = np.argpartition(-gains[candidates], r - 1)[:r]
+        candidates = candidates[top]
+
+    # fill the capacity of the candidates by decreasing gain until r is reached
+    candidates = candidates[np.argsort(-gains[candidates], kind='stable')]
+    filled_before = np.cumsum(capacity[candidates]) - capacity[candidates]
+    m[candidates] = np.clip(r - filled_before, 0, capacity[candidates])
+    return m
+
+
+def solve_m_cvxpy(gains: NDArray[float], capacity: NDArray[int], r: int) -> NDArray[float]:
+    """
+    Solve the same integer program of solve_m_greedy with cvxpy. It's much slower,
+    and it's only kept as a reference to validate solve_m_greedy.
+    """
+    import cvxpy as cvx
 
-def argmax_m(f: Objective, r: int,
-             characteristic_vectors: NDArray[int]) -> NDArray[int]:
     # variable to be found with optimization
-    m = cvx.Variable(shape=(f.n, ), integer=True)
+    m = cvx.Variable(shape=(len(gains), ), integer=True)
 
-    # define static constraints
-    cardinality_constraint = np.sum(m) <= r
-    lower_bounds = [
-      m[e] >= 0
-      for e in f.V
-    ]
-    upper_bounds = [
-      m[e] <= f.B[e]
-      for e in f.V
+    constraints = [
+        cvx.sum(m) <= r,
+        m >= 0,
+        m <= capacity,
     ]
-    
-    def helper(x: NDArray[int], prev_value: float):     
-      # compute f(e | x) for all e in f.V
-      f_marginal_gains = [
-        f.value(one_e + x) - prev_value
-        for one_e in characteristic_vectors
-      ]
-
-      # objective function
-      objective = cvx.Maximize(m.T @ f_marginal_gains)
-
-      # dynamic constraints
-      constraints = [
-        cardinality_constraint,
-        *lower_bounds,
-        *upper_bounds,
-        *(
-          m[e] + x[e] <= f.B[e]
-          for e in f.V
-        )
-      ]
-
-      # use cvxpy to solve the objective
-      problem = cvx.Problem(objective, constraints)
-
-      # solve the optimization problem
-      problem.solve(verbose=False)
-
-      # retrieve the value of y
-      m_values = m.value
-      return m_values
+
+    # use cvxpy to solve the objective
+    problem = cvx.Problem(cvx.Maximize(m @ gains), constraints)
+    problem.solve(verbose=False)
+
+    # retrieve the value of m
+    return np.maximum(np.round(m.value), 0)
+
+
+M_SOLVER_MAP = {
+    'greedy': solve_m_greedy,
+    'cvxpy': solve_m_cvxpy,
+}
+
+
+def argmax_m(f: Objective, r: int,
+             solve_m: Callable[[NDArray[float], NDArray[int], int], NDArray[int]]
+             ) -> Callable[[IncrementalOracle], NDArray[int]]:
+    def helper(oracle: IncrementalOracle) -> NDArray[int]:
+      x = oracle.x
+
+      # compute f(e | x) for all e in f.V with a single batched oracle call
+      with f.call_site('marginal_gains'):
+        f_marginal_gains = oracle.value_steps(f.V, 1) - oracle.value
+
+      # maximize m @ f_marginal_gains s.t. sum(m) <= r and 0 <= m <= B - x
+      return solve_m(f_marginal_gains, f.B - x, r)
 
     return helper
@@ -0,0 +1,164 @@
+import math
+import numpy as np
+from contextlib import AbstractContextManager
+from nptyping import NDArray
+from typing import Any, Dict, Iterable, Tuple, Union
+from ..objective import Objective, SparseVector
+from .. import utils
+
+
+class Sieve(object):
+    def __init__(self, f: Objective, v: float):
+        """
+        Partial lattice solution of the sieve with guess v of the optimum value.
+        The solution is kept as a sparse vector, so that the memory of a sieve is
+        bounded by the cardinality constraint rather than by the size of the ground set.
+        It implements the subset of the IncrementalOracle interface used by utils.binary_search.
+        :param f: integer-lattice submodular function
+        :param v: guess of the optimum value
+        """
+        self.f = f
+        self.v = v
+        self.norm = 0
+        self._support: Dict[int, int] = {}
+        self._value = 0
+
+    @property
+    def x(self) -> SparseVector:
+        """
+        Return the sparse solution of the sieve.
+        """
+        return self._with_step(None, 0)
+
+    @property
+    def value(self) -> float:
+        """
+        Return f(x) for the solution x of the sieve.
+        """
+        return self._value
+
+    def call_site(self, name: str) -> AbstractContextManager:
+        return self.f.call_site(name)
+
+    def value_step(self, e: int, k: int) -> float:
+        """
+        Value oracle for f(x + k * 1_e).
+        """
+        return self.f.value(self._with_step(e, k))
+
+    def value_steps(self, E: NDArray[int],
+                    K: Union[int, NDArray[int]]) -> NDArray[(Any, ), float]:
+        """
+        Batched value oracle for f(x + K[i] * 1_{E[i]}) for each step (E[i], K[i]), which
+        counts as a single round trip. The batch is evaluated on the dense representation
+        of x, which only lives for the duration of the call.
+        """
+        return self.f.value_batch_steps(self.f.dense(self.x), np.asarray(E), K)
+
+    def commit(self, e: int, k: int, value: float):
+        """
+        Commit the step x <- x + k * 1_e.
+        """
+        self._support[e] = self._support.get(e, 0) + k
+        self.norm += k
+        self._value = value
+
+    def _with_step(self, e: Union[None, int], k: int) -> SparseVector:
+        """
+        Return the sparse representation of x + k * 1_e.
+        """
+        support = dict(self._support)
+        if e is not None:
+            support[e] = support.get(e, 0) + k
+
+        return SparseVector(self.f.n, list(support.keys()), list(support.values()))
+
+
+class SieveStreaming(object):
+    def __init__(self, f: Objective, r: int, eps: float, search_mode: str = 'binary'):
+        """
+        Single-pass sieve-streaming maximizer of a monotone DR-submodular function over
+        the integer lattice under cardinality constraint, for elements that arrive as
+        a stream of (e, B[e]) items.
+        Let m be the maximum f(1_e) seen so far. Since OPT is between m and r * m, there
+        is a sieve for every guess v = (1 + eps)^i of OPT in [m, 2 * r * m], i.e.
+        O(log(r) / eps) sieves. When e arrives, every sieve adds the maximum number of
+        copies k of e such that f(k * 1_e | x) >= k * (v / 2 - f(x)) / (r - |x|).
+        Sieves are created lazily as m grows, and dropped when v falls below m.
+        :param f: integer-lattice submodular function
+        :param r: cardinality constraint
+        :param eps: error threshold
+        :param search_mode: search mode of utils.binary_search
+        """
+        self.f = f
+        self.r = r
+        self.eps = eps
+        self.search_mode = search_mode
+        self.m = 0
+        self.sieves: Dict[int, Sieve] = {}
+
+    def process(self, e: int, b: int):
+        """
+        Process the stream item (e, b), where b is the upper bound of e.
+        """
+        with self.f.call_site('singleton_scan'):
+            singleton_value = self.f.value(SparseVector.singleton(self.f.n, e, 1))
+
+        # update the range of the guesses of OPT
+        if singleton_value > self.m:
+            self.m = singleton_value
+            i_low = math.ceil(math.log(self.m, 1 + self.eps))
+            i_high = math.floor(math.log(2 * self.r * self.m, 1 + self.eps))
+
+            self.sieves = {
+                i: self.sieves.get(i) or Sieve(self.f, (1 + self.eps) ** i)
+                for i in range(i_low, i_high + 1)
+            }
+
+        for sieve in self.sieves.values():
+            if sieve.norm == self.r:
+                continue
+
+            theta = (sieve.v / 2 - sieve.value) / (self.r - sieve.norm)
+            k_range = list(range(1, min(b, self.r - sieve.norm) + 1))
+
+            best_t = utils.binary_search(sieve, e, k_range, theta=theta,
+                                         mode=self.search_mode)
+
+            if best_t is not None:
+                k, candidate_value = best_t
+                sieve.commit(e, k, candidate_value)
+
+    def best(self) -> Tuple[SparseVector, float]:
+        """
+        Return the solution of the best sieve so far and its value.
+        """
+        if len(self.sieves) == 0:
+            return SparseVector(self.f.n, [], []), 0
+
+        sieve = max(self.sieves.values(), key=lambda sieve: sieve.value)
+        return sieve.x, sieve.value
+
+
+def sieve_streaming(f: Objective, r: int, eps: float, stream: Iterable[Tuple[int, int]],
+                    search_mode: str = 'binary') -> Tuple[NDArray[int], float]:
+    """
+    Run SieveStreaming in a single pass over the stream of (e, B[e]) items.
+    :param f: a DR-submodular monotone function
+    :param r: the cardinality constraint
+    :param eps: the error threshold
+    :param stream: iterable of (e, B[e]) items
+    :param search_mode: search mode of utils.binary_search
+    """
+    sieve_streaming = SieveStreaming(f, r, eps, search_mode=search_mode)
+
+    for e, b in stream:
+        sieve_streaming.process(e, b)
+
+        # return the best solution so far if the anytime budget of f ran out
+        if f.checkpoint(lambda: sieve_streaming.best()[1]):
+            break
+
+    x, value = sieve_streaming.best()
+    print(f'Sieve    n={f.n}; B={f.B_range}; r={r}; sieves={len(sieve_streaming.sieves)}; norm={np.sum(x.counts)}')
+    return f.dense(x), value
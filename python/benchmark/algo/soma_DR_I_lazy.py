@@ -0,0 +1,97 @@
+import heapq
+import numpy as np
+from nptyping import NDArray
+from typing import List, Tuple
+from ..objective import Objective
+from .. import utils
+
+
+def soma_DR_I_lazy(f: Objective, r: int, eps: float,
+                   search_mode: str = 'binary') -> Tuple[NDArray[int], float]:
+    """
+    Lazy variant of Soma'18 algorithm for maximizing a DR-submodular monotone function
+    over the integer lattice under cardinality constraint.
+    Since f is DR-submodular, f(1_e | x) can only decrease as x grows, and
+    f(k * 1_e | x) <= k * f(1_e | x). Hence an element whose last known f(1_e | x)
+    is below the current threshold theta can't be added to x, and Soma-DR-I would
+    spend a whole binary search on it only to find nothing.
+    Stale values of f(1_e | x) are kept in a max-heap, and only the elements whose
+    bound is at least theta are re-evaluated. Threshold levels without such elements
+    are skipped altogether. The returned solution is the same as Soma-DR-I's.
+    :param f: a DR-submodular monotone function
+    :param r: the cardinality constraint
+    :param eps: the error threshold
+    :param search_mode: search mode of utils.binary_search, either 'binary', 'k-ary' or 'galloping'
+    """
+    # c is the vector upper bound of the lattice domain
+    c = f.B
+
+    # the solution starts from the zero vector. The incremental oracle keeps track
+    # of the solution x and of its value f(x)
+    oracle = f.incremental()
+    x = oracle.x
+
+    # norm keeps track of the L-1 norm of x
+    norm = 0
+
+    # f(1_e) = f(1_e | 0) is the initial upper bound of the marginal gain of each e
+    with f.call_site('singleton_scan'):
+        singletons = f.value_singletons()
+    d = np.max(singletons)
+    theta = d
+    stop_theta = (eps / r) * d
+
+    # max-heap of (-upper bound of f(1_e | x), e)
+    heap: List[Tuple[float, int]] = [(-bound, e) for e, bound in zip(f.V, singletons)]
+    heapq.heapify(heap)
+
+    # whether the anytime budget of f ran out
+    stopped = False
+
+    while heap and norm < r and not stopped:
+        # skip the threshold levels that no upper bound reaches
+        while theta >= stop_theta and -heap[0][0] < theta:
+            theta = theta * (1 - eps)
+
+        if theta < stop_theta:
+            break
+
+        # elements that may still be added at the current threshold level, visited
+        # in the same order as Soma-DR-I
+        candidates = []
+        while heap and -heap[0][0] >= theta:
+            candidates.append(heapq.heappop(heap)[1])
+
+        for e in sorted(candidates):
+            # return the current solution if the anytime budget of f ran out
+            stopped = f.checkpoint(oracle.value)
+            if stopped:
+                break
+
+            k_max = np.min([c[e] - x[e], r - norm])
+
+            if k_max <= 0:
+                # e can't be added anymore, so it's dropped from the heap
+                continue
+
+            # refresh the upper bound of e
+            with f.call_site('bound_refresh'):
+                bound = oracle.value_step(e, 1) - oracle.value
+
+            if bound >= theta:
+                # find k in k_interval maximal such that f(k * 1_e | x) >= k * theta
+                k_range = list(range(1, k_max + 1))
+                best_t = utils.binary_search(oracle, e, k_range, theta=theta, mode=search_mode)
+
+                if best_t is not None:
+                    # We add to x the element in the that increases the value of f
+                    # the most, extracted k times.
+                    k, candidate_value = best_t
+                    oracle.commit(e, k, candidate_value)
+                    norm += k
+
+            heapq.heappush(heap, (-bound, e))
+
+        theta = theta * (1 - eps)
+
+    return x, oracle.value
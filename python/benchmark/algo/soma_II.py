@@ -1,68 +1,153 @@
 import numpy as np
+from collections import OrderedDict
 from nptyping import NDArray
-from typing import Union, Tuple
+from typing import Tuple, Union
 from ..objective import Objective
-from .. import utils
 
 
-def soma_II(f: Objective, r: int, eps: float) -> Tuple[NDArray[int], float]:
+class SingletonProfiles(object):
+    def __init__(self, f: Objective, max_size: int):
+        """
+        Lazily memoize the value profile k -> f(k * 1_e) of every element e.
+        The profiles don't depend on the current solution x, so each f(k * 1_e) is
+        evaluated at most once per run, as long as it's not evicted from the LRU
+        cache of at most max_size values.
+        :param f: integer-lattice submodular function
+        :param max_size: maximum number of memoized values
+        """
+        self.max_size = max_size
+
+        # oracle that is never committed, so that it answers f(k * 1_e) queries
+        # as single coordinate steps from the zero vector
+        self._oracle = f.incremental()
+
+        self._cache: 'OrderedDict[Tuple[int, int], float]' = OrderedDict()
+
+    def store(self, e: int, k: int, value: float):
+        """
+        Memoize f(k * 1_e) = value, evicting the least recently used value if needed.
+        """
+        self._cache[(e, k)] = value
+
+        if len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def value(self, e: int, k: int) -> float:
+        """
+        Return f(k * 1_e), evaluating it only if it's not memoized.
+        """
+        value = self._cache.get((e, k))
+
+        if value is None:
+            value = self._oracle.value_step(e, k)
+            self.store(e, k, value)
+        else:
+            self._cache.move_to_end((e, k))
+
+        return value
+
+
+def soma_II(f: Objective, r: int, eps: float,
+            profile_cache_size: int = 2**20) -> Tuple[NDArray[int], float]:
     """
     Implement Soma'18 algorithm for maximizing a submodular monotone function
     over the integer lattice under cardinality constraint.
     :param f: a DR-submodular monotone function
     :param r: the cardinality constraint
     :param eps: the error threshold
+    :param profile_cache_size: maximum number of memoized f(k * 1_e) values
     """
     # c is the vector upper bound of the lattice domain
     c = f.B
 
-    # the solution starts from the zero vector
-    x = np.zeros((f.n, ), dtype=int)
+    # the solution starts from the zero vector. The incremental oracle keeps track
+    # of the solution x and of its value f(x)
+    oracle = f.incremental()
+    x = oracle.x
 
     # norm keeps track of the L-1 norm of x
     norm = 0
 
-    d = max((f.value(c[e] * utils.char_vector(f, e)) for e in f.V))
+    # memoized value profiles k -> f(k * 1_e)
+    profiles = SingletonProfiles(f, max_size=profile_cache_size)
+
+    with f.call_site('singleton_scan'):
+        singletons = f.value_singletons(c)
+
+    # the singleton scan already evaluated f(c[e] * 1_e) for every e
+    for e, value in zip(f.V, singletons):
+        profiles.store(e, c[e], value)
+
+    d = np.max(singletons)
     theta = d
     stop_theta = (eps / r) * d
 
-    while theta >= stop_theta:
+    # whether the anytime budget of f ran out
+    stopped = False
+
+    while theta >= stop_theta and norm < r and not stopped:
         for e in f.V:
-            one_e = utils.char_vector(f, e)
+            # return the current solution if the anytime budget of f ran out
+            stopped = f.checkpoint(oracle.value)
+            if stopped:
+                break
+
             k_max = np.min([c[e] - x[e], r - norm])
-            
-            k = binary_search_lattice(f=f, one_e=one_e, theta=theta, k_max=k_max, eps=eps)
+
+            with f.call_site('binary_search'):
+                k = binary_search_lattice(profiles=profiles, e=e, theta=theta, k_max=k_max, eps=eps)
 
             if k is not None:
-                x = x + k * one_e
+                # the search only looks at the value profiles, so f(x + k * 1_e) is
+                # evaluated once per accepted step to keep f(x) up to date
+                with f.call_site('commit'):
+                    candidate_value = oracle.value_step(e, k)
+
+                oracle.commit(e, k, candidate_value)
                 norm += k
 
         theta = theta * (1 - eps)
 
-    return x, f.value(x)
+    return x, oracle.value
 
+def binary_search_lattice(profiles: SingletonProfiles, e: int, theta: float,
+                          k_max: int, eps: float) -> Union[int, None]:
+    """
+    Return k_max if f(k_max * 1_e) >= (1 - eps) * k_max * theta, and None otherwise.
+    Following Soma'18, the search starts from h = f(k_max * 1_e) and looks for the
+    largest k such that f(k * 1_e) >= h, lowering h down to (1 - eps) * f(k_min * 1_e),
+    where k_min is the smallest k such that f(k * 1_e) > 0. Since h only decreases
+    from f(k_max * 1_e), that k is always k_max, so only f(k_max * 1_e) and
+    f(k_min * 1_e) are needed. k_min is found by binary search over the profile of e,
+    which is non-decreasing for monotone f.
+    :param profiles: memoized value profiles
+    :param e: element to add to the solution
+    :param theta: threshold
+    :param k_max: maximum number of copies of e that can be added
+    :param eps: the error threshold
+    """
+    if k_max <= 0:
+        return None
 
-def binary_search_lattice(f: Objective, one_e: NDArray[int], theta: float,
-                          k_max: int, eps: float) -> Union[float, None]:
-    # find the minimum k_min with 0 <= k_min <= k_max such that f(k_min * one_e) > 0.
-    lazy_list = ((k_min, f.value(k_min * one_e)) for k_min in range(0, k_max + 1))
-    lazy_list = filter(lambda x: x[1] > 0, lazy_list)
-    k_min, k_min_e_value = min(lazy_list, key=utils.fst, default=(None, None))
+    h = profiles.value(e, k_max)
 
-    if k_min is None:
-      return None
+    # f(k * 1_e) <= f(k_max * 1_e) <= 0 for all k, so no k_min exists
+    if h <= 0:
+        return None
 
-    h = f.value(k_max * one_e)
-    stop_h = (1 - eps) * k_min_e_value
+    # find the minimum k_min with 1 <= k_min <= k_max such that f(k_min * 1_e) > 0
+    k_low, k_high = 1, k_max
+    while k_low < k_high:
+        k_mid = (k_low + k_high) // 2
 
-    while h >= stop_h:
-        lazy_list = ((k, f.value(k * one_e)) for k in range(k_min, k_max + 1))
-        lazy_list = filter(lambda x: x[1] >= h, lazy_list)
-        k, k_e_value = max(lazy_list, default=-1)
+        if profiles.value(e, k_mid) > 0:
+            k_high = k_mid
+        else:
+            k_low = k_mid + 1
 
-        if k_e_value >= (1 - eps) * k * theta:
-            return k
+    stop_h = (1 - eps) * profiles.value(e, k_low)
 
-        h = (1 - eps) * h
+    if h >= stop_h and h >= (1 - eps) * k_max * theta:
+        return k_max
 
     return None
@@ -0,0 +1,81 @@
+import time
+from typing import Callable, Dict, List, Union
+
+
+class AnytimeBudget(object):
+    def __init__(self, timeouts: List[float], max_calls: int = 0):
+        """
+        Wall-clock and oracle-call budget of an anytime run. The maximizers report the
+        value of their current feasible solution with f.checkpoint(value), and return
+        that solution as soon as the budget runs out. For every timeout, the budget
+        records the value reached and the oracle calls used by then, i.e. at the last
+        checkpoint before the timeout, and whether the run had already finished.
+        :param timeouts: timeouts in seconds. The run is stopped at the last one
+        :param max_calls: maximum number of oracle calls, 0 means no limit
+        """
+        self.timeouts = sorted(timeouts)
+        self.max_calls = max_calls
+        self.start()
+
+    def start(self):
+        """
+        Start the clock of a new run.
+        """
+        self.records: List[Dict] = []
+        self.exhausted = False
+
+        # value and oracle calls at the last checkpoint
+        self._value = 0
+        self._n_calls = 0
+
+        # index of the first timeout that hasn't been recorded yet
+        self._next = 0
+        self._t_start_ns = time.perf_counter_ns()
+
+    @property
+    def elapsed_s(self) -> float:
+        return (time.perf_counter_ns() - self._t_start_ns) / 1e9
+
+    def checkpoint(self, n_calls: int, value: Union[float, Callable[[], float]]) -> bool:
+        """
+        Report the value of the current solution after n_calls oracle calls.
+        :param n_calls: number of oracle calls performed so far
+        :param value: value of the current solution, or a thunk that computes it
+        :return: True iff the budget ran out, in which case the run should stop
+        """
+        elapsed_s = self.elapsed_s
+        self._record_until(elapsed_s, finished=False)
+
+        self._value = value() if callable(value) else value
+        self._n_calls = n_calls
+
+        self.exhausted = (len(self.timeouts) > 0 and elapsed_s >= self.timeouts[-1]) or \
+                         (self.max_calls > 0 and n_calls >= self.max_calls)
+        return self.exhausted
+
+    def finish(self, n_calls: int, value: float) -> List[Dict]:
+        """
+        Record the final value of the run after n_calls oracle calls. The timeouts
+        that expire after the end of the run are given the final value.
+        :return: one record per timeout
+        """
+        self._record_until(self.elapsed_s, finished=False)
+
+        self._value = value
+        self._n_calls = n_calls
+        self._record_until(float('inf'), finished=not self.exhausted)
+
+        return self.records
+
+    def _record_until(self, elapsed_s: float, finished: bool):
+        """
+        Record the value at the last checkpoint for every timeout expired before elapsed_s.
+        """
+        while self._next < len(self.timeouts) and self.timeouts[self._next] < elapsed_s:
+            self.records.append({
+                'timeout_s': self.timeouts[self._next],
+                'approx': self._value,
+                'n_calls': self._n_calls,
+                'finished': finished,
+            })
+            self._next += 1
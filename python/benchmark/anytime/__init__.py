@@ -0,0 +1 @@
+from .AnytimeBudget import AnytimeBudget
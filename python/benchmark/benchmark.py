@@ -1,12 +1,95 @@
 import os
+import csv
+import json
 import hydra
 import time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Dict, Tuple, Union
 from omegaconf import DictConfig
 from pathlib import Path
 from . import conf_utils
-from .df_utils import BenchmarkDF
-from ..rng import rng
+from .df_utils import BenchmarkDF, ArrowSink
+from .objective import Objective, CachedObjective, InstrumentedObjective
+from .metrics import CpuTime, OracleMetrics, PeakMemory
+from .instance_store import InstanceStore
+from .anytime import AnytimeBudget
+from ..rng import rng, stream_rng
+
+
+# arguments of run_replicate inherited by the worker processes when they are forked
+_worker_args: Tuple = None
+
+
+def _init_worker(*args):
+    global _worker_args
+    _worker_args = args
+
+
+def _run_replicate(i: int) -> Dict:
+    return run_replicate(*_worker_args, i=i)
+
+
+def run_replicate(f: Objective, r: int, cfg: DictConfig, key: Tuple,
+                  budget: Union[None, AnytimeBudget], n_workers: int, i: int) -> Dict:
+    """
+    Run the i-th replicate of the selected algorithm on f, with the random stream
+    identified by (*key, i), and starting from a fresh f, so that the results don't
+    depend on the replicates that ran before in the same process.
+    :param f: integer-lattice submodular function
+    :param r: cardinality constraint
+    :param cfg: Hydra configuration dictionary
+    :param key: key of the random streams of the replicates
+    :param budget: optional anytime budget attached to f
+    :param n_workers: number of worker processes of the algorithm
+    :param i: index of the replicate, starting from 1
+    """
+    f.reset()
+
+    # import the selected algorithm to maximize f w.r.t. the cardinality constraint r
+    maximizer = conf_utils.get_algo(stream_rng(*key, i), f, r, cfg=cfg, n_workers=n_workers)
+
+    if budget is not None:
+        budget.start()
+
+    peak_memory = PeakMemory()
+
+    # the CPU time includes the worker processes of the algorithm, the peak memory
+    # is the one of the current process only
+    t_start = time.perf_counter_ns()
+    cpu_time = CpuTime()
+    x, approx = maximizer()
+    cpu_time_ns = cpu_time.total_ns
+    time_ns = time.perf_counter_ns() - t_start
+
+    # the time spent in the oracle is only measured when f is instrumented
+    oracle_time_ns, singleton_scan_time_ns = None, None
+    if cfg.runtime.metrics:
+        oracle_time_ns = f.metrics.time_ns
+        singleton_scan_time_ns = f.metrics.site_time_ns('singleton_scan')
+
+    # n_calls is the number of oracle calls, n_rounds is the number of oracle round
+    # trips, where a batched call counts once, n_evals is the number of oracle calls
+    # that weren't answered by the cache
+    return {
+        'i': i,
+        'approx': approx,
+        'n_calls': f.n_calls,
+        'n_rounds': f.n_rounds,
+        'n_evals': f.n_evals,
+        'n_hits': f.n_hits,
+        'n_work': f.n_work,
+        'time_ns': time_ns,
+        'cpu_time_ns': cpu_time_ns,
+        'oracle_time_ns': oracle_time_ns,
+        'singleton_scan_time_ns': singleton_scan_time_ns,
+        'peak_rss': peak_memory.peak_bytes,
+        # whether the run returned before its anytime budget ran out
+        'finished': budget is None or not budget.exhausted,
+        'anytime': None if budget is None else budget.finish(f.n_calls, approx),
+        'metrics': f.metrics.to_dict() if cfg.runtime.metrics else None,
+    }
 
 
 @hydra.main(config_path='../conf', config_name='config')
@@ -30,34 +113,143 @@ def benchmark(cfg: DictConfig) -> None:
     # run deterministic algorithms only once
     n_samples = cfg.runtime.n_samples if cfg.algo.is_randomized else 1
 
+    # the replicates run in n_jobs forked processes. Each replicate draws from its own
+    # random stream, so the results don't depend on n_jobs. The algorithms don't fork
+    # worker processes of their own within the replicate processes
+    n_jobs = min(cfg.runtime.n_jobs, n_samples)
+    n_workers = cfg.runtime.n_workers if n_jobs == 1 else 1
+
     ########################
     #  Run the maximizers  #
     ########################
 
     out_csv_filename = os.path.join(output_benchmarks, f'{cfg.algo.algorithm}.csv')
-    print(f'Creating {out_csv_filename}...')
-
-    with open(out_csv_filename, 'w+') as out_csv:
-        for f, r in conf_utils.get_objective(rng=rng, dataset_dir=dataset_dir, cfg=cfg):
 
-            # import the selected algorithm to maximize f w.r.t. the cardinality constraint r
-            maximizer = conf_utils.get_algo(rng, f, r, cfg=cfg)
+    # in resume mode, the runs already in the csv file are skipped and the new rows are
+    # appended to the outputs, otherwise the outputs are overwritten
+    resume = cfg.runtime.resume
+    completed_runs = BenchmarkDF.completed_runs(out_csv_filename) if resume else set()
+    open_mode = 'a' if resume else 'w+'
+
+    # the sidecars of the runs of the benchmark
+    out_metrics_filename = os.path.join(output_benchmarks, f'{cfg.algo.algorithm}.metrics.jsonl')
+    out_anytime_filename = os.path.join(output_benchmarks, f'{cfg.algo.algorithm}.anytime.csv')
+
+    if resume:
+        # keep only the records of the completed runs in the sidecars
+        BenchmarkDF.repair_sidecar(out_metrics_filename, completed_runs)
+        BenchmarkDF.repair_sidecar(out_anytime_filename, completed_runs, record_key=('timeout_s', ))
+        print(f'Resuming {out_csv_filename} ({len(completed_runs)} runs completed)...')
+    else:
+        print(f'Creating {out_csv_filename}...')
+
+    # columnar copy of the results, partitioned by objective and algorithm
+    sink = ArrowSink(f'{basedir}/out/arrow/obj={f_name}/algo={cfg.algo.algorithm}', append=resume)
+
+    # optional sidecar with the oracle metrics of every run
+    out_metrics = open(out_metrics_filename, open_mode) if cfg.runtime.metrics else None
+
+    # optional on-disk store of the objective instances, shared by all jobs
+    store = InstanceStore(f'{basedir}/.instance_store') if cfg.runtime.instance_store else None
+
+    # optional anytime budget of every run, and the sidecar with the value reached by every timeout
+    budget = None
+    out_anytime = None
+    if cfg.runtime.anytime.enabled:
+        budget = AnytimeBudget(list(cfg.runtime.timeouts), max_calls=cfg.runtime.anytime.max_calls)
+
+        out_anytime = open(out_anytime_filename, open_mode, newline='')
+        anytime_writer = csv.DictWriter(out_anytime, fieldnames=[
+            'n', 'b_low', 'b_high', 'r', 'i', 'timeout_s', 'approx', 'n_calls', 'finished'
+        ])
+
+        if out_anytime.tell() == 0:
+            anytime_writer.writeheader()
+
+    with open(out_csv_filename, open_mode) as out_csv:
+        t_load = time.perf_counter_ns()
+        fr = conf_utils.get_objective(rng=rng, dataset_dir=dataset_dir, cfg=cfg, store=store)
+
+        # time spent loading the datasets and generating, or memory-mapping, all the instances.
+        # Every instance is generated even when resuming, so that they are identical to the
+        # ones of the original run
+        load_time_ns = time.perf_counter_ns() - t_load
+
+        for j, (f, r) in enumerate(fr):
+            b_low, b_high = f.B_range
+
+            # replicates that haven't been completed yet
+            n_samples_left = [
+                n_sample for n_sample in range(1, n_samples + 1)
+                if (f.n, int(b_low), int(b_high), int(r), n_sample) not in completed_runs
+            ]
+
+            if len(n_samples_left) == 0:
+                print(f'\nSkipping n={f.n}; B=[{b_low}, {b_high}]; r={r} (completed)')
+                continue
+
+            # optionally memoize the oracle calls of f
+            if cfg.runtime.cache_size > 0:
+                f = CachedObjective(f, max_size=cfg.runtime.cache_size)
+
+            # optionally record the latency and the call site of every oracle call
+            if cfg.runtime.metrics:
+                f = InstrumentedObjective(f, metrics=OracleMetrics())
+
+            # the maximizers check the anytime budget at their checkpoints
+            f.set_budget(budget)
+
+            # the random streams of the replicates of the selected algorithm on the j-th instance
+            key = (f_name, j, cfg.algo.algorithm)
+
+            if n_jobs > 1 and len(n_samples_left) > 1:
+                mp_context = mp.get_context('fork')
+                with ProcessPoolExecutor(min(n_jobs, len(n_samples_left)), mp_context=mp_context,
+                                         initializer=_init_worker,
+                                         initargs=(f, r, cfg, key, budget, n_workers)) as executor:
+                    results = list(executor.map(_run_replicate, n_samples_left))
+            else:
+                results = []
+                for n_sample in n_samples_left:
+                    results.append(run_replicate(f, r, cfg, key, budget, n_workers, i=n_sample))
+
+                    if cfg.runtime.metrics:
+                        # the next replicate is expected to perform as many oracle calls
+                        f.metrics.expected_calls = results[-1]['n_calls']
 
             # initialize BenchmarkDF for current batch
-            with BenchmarkDF(f=f, r=r, out_csv=out_csv, verbose=True) as benchmark_df:
-                for n_sample in range(1, n_samples + 1):
-
-                    t_start = time.time_ns()
-                    x, approx = maximizer()
-                    time_ns = time.time_ns() - t_start
-
-                    # n_calls is the number of oracle calls
-                    n_calls = f.n_calls
-
-                    benchmark_df.add(i=n_sample, approx=approx, n_calls=n_calls,
-                                     time_ns=time_ns)
-
-                    # reset the counter of oracle calls for f
-                    f.reset()
+            sidecars = [sidecar for sidecar in (out_anytime, out_metrics) if sidecar is not None]
+            with BenchmarkDF(f=f, r=r, out_csv=out_csv, verbose=True, sink=sink,
+                             sidecars=sidecars) as benchmark_df:
+                for result in sorted(results, key=lambda result: result['i']):
+                    n_sample = result['i']
+
+                    benchmark_df.add(i=n_sample, approx=result['approx'], n_calls=result['n_calls'],
+                                     time_ns=result['time_ns'], n_evals=result['n_evals'],
+                                     n_hits=result['n_hits'], n_rounds=result['n_rounds'],
+                                     finished=result['finished'], cpu_time_ns=result['cpu_time_ns'],
+                                     oracle_time_ns=result['oracle_time_ns'],
+                                     singleton_scan_time_ns=result['singleton_scan_time_ns'],
+                                     load_time_ns=load_time_ns, peak_rss=result['peak_rss'])
+
+                    if out_anytime is not None:
+                        for record in result['anytime']:
+                            anytime_writer.writerow({'n': f.n, 'b_low': int(b_low), 'b_high': int(b_high),
+                                                     'r': int(r), 'i': n_sample, **record})
+
+                    if out_metrics is not None:
+                        record = {'n': f.n, 'b_low': int(b_low), 'b_high': int(b_high),
+                                  'r': int(r), 'i': n_sample, 'n_work': int(result['n_work']),
+                                  **result['metrics']}
+                        out_metrics.write(json.dumps(record) + '\n')
+
+            # reset the counter of oracle calls for f
+            f.reset()
+
+    if out_metrics is not None:
+        out_metrics.close()
+
+    if out_anytime is not None:
+        out_anytime.close()
 
     print(f'OK')
@@ -4,58 +4,71 @@ from ..objective import Objective
 from ..algo import SGL_a, SGL_b, SGL_c, SGL_d, \
                   SGL_I, SGL_II, \
                   SSG, \
-                  soma_DR_I, soma_II, \
-                  lai_DR
+                  soma_DR_I, soma_DR_I_lazy, soma_II, \
+                  lai_DR, \
+                  adaptive_sequencing, \
+                  greedi, \
+                  sieve_streaming
 
 
 ALGO_MAP = {
-    'SGL-a': lambda *args: load_SGL_a(*args),
-    'SGL-b': lambda *args: load_SGL_b(*args),
-    'SGL-c': lambda *args: load_SGL_c(*args),
-    'SGL-d': lambda *args: load_SGL_d(*args),
-    'SGL-I': lambda *args: load_SGL_I(*args),
-    'SGL-II': lambda *args: load_SGL_II(*args),
-    # 'SGL-II-b': lambda *args: load_SGL_II_b(*args),
-    'SSG': lambda *args: load_SSG(*args),
-    'Soma-DR-I': lambda *args: load_soma_DR_I(*args),
-    'Soma-II': lambda *args: load_soma_II(*args),
-    'Lai-DR': lambda *args: load_laid_DR(*args),
+    'SGL-a': lambda *args, **kwargs: load_SGL_a(*args, **kwargs),
+    'SGL-b': lambda *args, **kwargs: load_SGL_b(*args, **kwargs),
+    'SGL-c': lambda *args, **kwargs: load_SGL_c(*args, **kwargs),
+    'SGL-d': lambda *args, **kwargs: load_SGL_d(*args, **kwargs),
+    'SGL-I': lambda *args, **kwargs: load_SGL_I(*args, **kwargs),
+    'SGL-II': lambda *args, **kwargs: load_SGL_II(*args, **kwargs),
+    # 'SGL-II-b': lambda *args, **kwargs: load_SGL_II_b(*args, **kwargs),
+    'SSG': lambda *args, **kwargs: load_SSG(*args, **kwargs),
+    'Soma-DR-I': lambda *args, **kwargs: load_soma_DR_I(*args, **kwargs),
+    'Soma-DR-I-lazy': lambda *args, **kwargs: load_soma_DR_I_lazy(*args, **kwargs),
+    'Soma-II': lambda *args, **kwargs: load_soma_II(*args, **kwargs),
+    'Lai-DR': lambda *args, **kwargs: load_laid_DR(*args, **kwargs),
+    'Adaptive-Sequencing': lambda *args, **kwargs: load_adaptive_sequencing(*args, **kwargs),
+    'GreeDi': lambda *args, **kwargs: load_greedi(*args, **kwargs),
+    'Sieve-Streaming': lambda *args, **kwargs: load_sieve_streaming(*args, **kwargs),
 }
 
 
-def load_SGL_a(rng: np.random.Generator, f: Objective, r: int):
+def load_SGL_a(rng: np.random.Generator, f: Objective, r: int,
+               search_mode: str = 'binary', **kwargs):
     def load():
-        x, value = SGL_a(rng, f, r, eps=get_eps(f))
+        x, value = SGL_a(rng, f, r, eps=get_eps(f), search_mode=search_mode)
         return x, value
 
     return load
 
 
-def load_SGL_b(rng: np.random.Generator, f: Objective, r: int):
+def load_SGL_b(rng: np.random.Generator, f: Objective, r: int,
+               search_mode: str = 'binary', **kwargs):
     def load():
-        x, value = SGL_b(rng, f, r, eps=get_eps(f))
+        x, value = SGL_b(rng, f, r, eps=get_eps(f), search_mode=search_mode)
         return x, value
 
     return load
 
 
-def load_SGL_c(rng: np.random.Generator, f: Objective, r: int):
+def load_SGL_c(rng: np.random.Generator, f: Objective, r: int,
+               n_workers: int = 1, search_mode: str = 'binary', **kwargs):
     def load():
-        x, value = SGL_c(rng, f, r, eps=get_eps(f))
+        x, value = SGL_c(rng, f, r, eps=get_eps(f), n_workers=n_workers,
+                         search_mode=search_mode)
         return x, value
 
     return load
 
 
-def load_SGL_d(rng: np.random.Generator, f: Objective, r: int):
+def load_SGL_d(rng: np.random.Generator, f: Objective, r: int,
+               n_workers: int = 1, search_mode: str = 'binary', **kwargs):
     def load():
-        x, value = SGL_d(rng, f, r, eps=get_eps(f))
+        x, value = SGL_d(rng, f, r, eps=get_eps(f), n_workers=n_workers,
+                         search_mode=search_mode)
         return x, value
 
     return load
 
 
-def load_SSG(rng: np.random.Generator, f: Objective, r: int):
+def load_SSG(rng: np.random.Generator, f: Objective, r: int, **kwargs):
     def load():
         x, value = SSG(rng, f, r, eps=get_eps(f))
         return x, value
@@ -63,15 +76,25 @@ def load_SSG(rng: np.random.Generator, f: Objective, r: int):
     return load
 
 
-def load_soma_DR_I(_: np.random.Generator, f: Objective, r: int):
+def load_soma_DR_I(_: np.random.Generator, f: Objective, r: int,
+                   search_mode: str = 'binary', **kwargs):
     def load():
-        x, value = soma_DR_I(f, r, eps=get_eps(f))
+        x, value = soma_DR_I(f, r, eps=get_eps(f), search_mode=search_mode)
         return x, value
 
     return load
 
 
-def load_soma_II(_: np.random.Generator, f: Objective, r: int):
+def load_soma_DR_I_lazy(_: np.random.Generator, f: Objective, r: int,
+                        search_mode: str = 'binary', **kwargs):
+    def load():
+        x, value = soma_DR_I_lazy(f, r, eps=get_eps(f), search_mode=search_mode)
+        return x, value
+
+    return load
+
+
+def load_soma_II(_: np.random.Generator, f: Objective, r: int, **kwargs):
     def load():
         x, value = soma_II(f, r, eps=get_eps(f))
         return x, value
@@ -79,15 +102,56 @@ def load_soma_II(_: np.random.Generator, f: Objective, r: int):
     return load
 
 
-def load_laid_DR(rng: np.random.Generator, f: Objective, r: int):
+def load_laid_DR(rng: np.random.Generator, f: Objective, r: int,
+                 m_solver: str = 'greedy', **kwargs):
+    def load():
+        x, value = lai_DR(rng, f, r, m_solver=m_solver)
+        return x, value
+
+    return load
+
+
+def load_adaptive_sequencing(rng: np.random.Generator, f: Objective, r: int,
+                             n_workers: int = 1, eps: float = 0.1, **kwargs):
     def load():
-        x, value = lai_DR(rng, f, r)
+        x, value = adaptive_sequencing(rng, f, r, eps=eps, n_workers=n_workers)
         return x, value
 
     return load
 
 
-def load_SGL_I(rng: np.random.Generator, f: Objective, r: int):
+def load_greedi(rng: np.random.Generator, f: Objective, r: int,
+                n_workers: int = 1, n_shards: int = 4, base: str = 'Soma-DR-I-lazy', **kwargs):
+    def load():
+        x, value = greedi(rng, f, r, eps=get_eps(f), n_shards=n_shards, base=base,
+                          n_workers=n_workers)
+        return x, value
+
+    return load
+
+
+def load_sieve_streaming(rng: np.random.Generator, f: Objective, r: int,
+                         search_mode: str = 'binary', eps: float = 0.1,
+                         order: str = 'random', **kwargs):
+    def load():
+        # order in which the elements of the ground set arrive
+        if order == 'random':
+            V = rng.permutation(f.n)
+        elif order == 'reversed':
+            V = np.arange(f.n)[::-1]
+        elif order == 'index':
+            V = np.arange(f.n)
+        else:
+            raise ValueError(f'Unknown stream order: {order}')
+
+        stream = ((e, f.B[e]) for e in V)
+        x, value = sieve_streaming(f, r, eps=eps, stream=stream, search_mode=search_mode)
+        return x, value
+
+    return load
+
+
+def load_SGL_I(rng: np.random.Generator, f: Objective, r: int, **kwargs):
     def load():
         x, value = SGL_I(rng, f, r, eps=get_eps(f))
         return x, value
@@ -95,7 +159,7 @@ def load_SGL_I(rng: np.random.Generator, f: Objective, r: int):
     return load
 
 
-def load_SGL_II(rng: np.random.Generator, f: Objective, r: int):
+def load_SGL_II(rng: np.random.Generator, f: Objective, r: int, **kwargs):
     def load():
         x, value = SGL_II(rng, f, r, eps=get_eps(f))
         return x, value
@@ -104,7 +168,7 @@ def load_SGL_II(rng: np.random.Generator, f: Objective, r: int):
 
 
 """
-def load_SGL_II_b(rng: np.random.Generator, f: Objective, r: int):
+def load_SGL_II_b(rng: np.random.Generator, f: Objective, r: int, **kwargs):
     def load():
         x, value = SGL_II_b(rng, f, r, eps=get_eps(f))
         return x, value
@@ -118,14 +182,26 @@ def get_eps(f: Objective):
 
 
 def get_algo(rng: np.random.Generator, f: Objective,
-             r: int, cfg: DictConfig):
+             r: int, cfg: DictConfig, n_workers: int = None):
     """
     Return an instance of the selected integer-lattice submodular objective
     :param rng: numpy random generator instance
     :param f: integer lattice submodular function
     :param r: cardinality constraint
     :param cfg: Hydra configuration dictionary
+    :param n_workers: number of worker processes of the algorithm, defaults to cfg.runtime.n_workers
     """
     algo_name = cfg.algo.algorithm
     print(f'Importing algorithm: {algo_name}\n')
-    return ALGO_MAP[algo_name](rng, f, r)
+
+    # algorithm-specific parameters, e.g. 'm_solver' in conf/algo/Lai-DR.yaml
+    algo_params = {
+        key: value for key, value in cfg.algo.items()
+        if key not in ('algorithm', 'is_randomized')
+    }
+
+    if n_workers is None:
+        n_workers = cfg.runtime.n_workers
+
+    return ALGO_MAP[algo_name](rng, f, r, n_workers=n_workers,
+                               search_mode=cfg.runtime.search_mode, **algo_params)
@@ -1,10 +1,11 @@
-from typing import Iterator, Tuple, Dict, List
+from typing import Iterator, Tuple, Dict, List, Union
 import numpy as np
 from nptyping import NDArray
-from omegaconf import DictConfig
+from omegaconf import DictConfig, OmegaConf
 from ..objective import Objective, DemoMonotone, DemoMonotoneSkewed, \
                        DemoNonMonotone, FacilityLocation, BudgetAllocation
 from .. import dataset_utils
+from ..instance_store import InstanceStore
 
 
 def compute_B(rng: np.random.Generator,
@@ -29,6 +30,16 @@ OBJ_MAP = {
 }
 
 
+# objective class of each objective name, used to rebuild stored instances
+OBJ_CLASS_MAP = {
+    'demo_monotone': DemoMonotone,
+    'demo_monotone_skewed': DemoMonotoneSkewed,
+    'demo_non_monotone': DemoNonMonotone,
+    'facility_location': FacilityLocation,
+    'budget_allocation': BudgetAllocation,
+}
+
+
 def load_demo_monotone(rng: np.random.Generator,
                        params,
                        **kwargs) -> List[Tuple[Objective, int]]:
@@ -95,13 +106,17 @@ def load_facility_location(rng: np.random.Generator,
     :param params: 'params.demo_facility_location' dictionary entry in conf/config.yaml
     """
     print(f'Loading Movielens 100k...')
-    G = dataset_utils.import_movielens_100k(dataset_dir)
+    G = dataset_utils.import_movielens_100k(dataset_dir, n_edges=params.benchmark.get('n_edges', 100))
     print(f'...Movielens 100k successfully loaded')
     br: List[Tuple[int, int]] = params.benchmark.br
+
+    # number of facilities in the ground set
+    n = sum(1 for v in G.nodes if G.nodes[v]['bipartite'] == 0)
     
     fr: List[Tuple[Objective, int]] = [None] * len(br)
     for i, (b, r) in enumerate(br):
-        fr[i] = (FacilityLocation(G=G, b=b), r)
+        B = np.full((n, ), fill_value=b)
+        fr[i] = (FacilityLocation(G=G, B=B, B_range=(b, b)), r)
 
     return fr
 
@@ -139,16 +154,50 @@ def load_budget_allocation(rng: np.random.Generator,
 
 def get_objective(rng: np.random.Generator,
                   dataset_dir: str,
-                  cfg: DictConfig) -> List[Tuple[Objective, int]]:
+                  cfg: DictConfig,
+                  store: Union[None, InstanceStore] = None) -> List[Tuple[Objective, int]]:
     """
     Return an instance of the selected set-submodular objective
     :param rng: numpy random generator instance
     :param dataset_dir: datasets main directory
     :param cfg: Hydra configuration dictionary
+    :param store: optional instance store. If the instances have already been stored,
+                  they are memory-mapped from disk instead of being generated again
     """
     objective_name = cfg.obj.name
 
     print(f'Loading f: {objective_name}\n')
-    return OBJ_MAP[objective_name](rng=rng,
-                                   params=cfg.obj,
-                                   dataset_dir=dataset_dir)
+
+    if store is None:
+        return OBJ_MAP[objective_name](rng=rng,
+                                       params=cfg.obj,
+                                       dataset_dir=dataset_dir)
+
+    key = store.key(objective_name, OmegaConf.to_container(cfg.obj, resolve=True),
+                    rng.bit_generator.state)
+    stored = store.load(key)
+
+    if stored is not None:
+        print(f'Loading f from the instance store ({key})')
+        instances, meta = stored
+
+        # leave rng in the same state it would be in after generating the instances
+        rng.bit_generator.state = meta['rng_state']
+
+        obj_class = OBJ_CLASS_MAP[objective_name]
+        return [
+            (obj_class.from_arrays(arrays, B_range=tuple(B_range)), r)
+            for arrays, (B_range, r) in zip(instances, meta['B_range_r'])
+        ]
+
+    fr = OBJ_MAP[objective_name](rng=rng,
+                                 params=cfg.obj,
+                                 dataset_dir=dataset_dir)
+
+    meta = {
+        'rng_state': rng.bit_generator.state,
+        'B_range_r': [([int(b) for b in f.B_range], int(r)) for f, r in fr],
+    }
+    store.save(key, [f.arrays() for f, _ in fr], meta)
+
+    return fr
@@ -1,12 +1,14 @@
 import itertools
 import networkx as nx
-from typing import Tuple
+from typing import Tuple, Union
 from .. import utils
 
 
-def import_movielens_100k(basedir: str) -> Tuple[nx.Graph, int]:
+def import_movielens_100k(basedir: str, n_edges: Union[None, int] = 100) -> Tuple[nx.Graph, int]:
     """
     Import graph for facility_location.
+    :param basedir: datasets main directory
+    :param n_edges: maximum number of edges to keep, or None to keep all of them
     :return: the bipartite graph G=(V,T;W).
     """
     localpath = 'dataset/konect/movielens-100k_rating/rel.rating'
@@ -50,17 +52,17 @@ def import_movielens_100k(basedir: str) -> Tuple[nx.Graph, int]:
                 ), enumerate(edges)
             )
         ))
-        edges = edges[:100]
-        
+        edges = edges[:n_edges]
+
         facility_ids = set()
         customer_ids = set()
         for facility_id, customer_id, _ in edges:
             facility_ids.add(facility_id)
             customer_ids.add(customer_id)
 
-        print(f'n facility_ids: {len(facility_ids)}')   # 75
-        print(f'n customer_ids: {len(customer_ids)}')   # 91 
-        print(f'n edges: {len(edges)}')                 # 100
+        print(f'n facility_ids: {len(facility_ids)}')   # 75 with n_edges=100
+        print(f'n customer_ids: {len(customer_ids)}')   # 91 with n_edges=100
+        print(f'n edges: {len(edges)}')                 # 100 with n_edges=100
 
         facility_ids_to_node = dict(zip(sorted(facility_ids), itertools.count(start=0, step=1)))
         customer_ids_to_node = dict(zip(sorted(customer_ids), itertools.count(start=len(facility_ids), step=1)))
@@ -0,0 +1,55 @@
+import os
+import pandas as pd
+import pyarrow as pa
+from glob import glob
+from pathlib import Path
+
+
+class ArrowSink(object):
+    def __init__(self, out_dir: str, append: bool = False):
+        """
+        Columnar sink of the benchmark results. Every call to write() stores a typed record
+        batch in a new Arrow IPC part file of out_dir. The part is written to a hidden
+        temporary file which is then atomically renamed, so a crash loses at most the
+        batch being written.
+        out_dir is meant to be the partition <root>/obj=<obj>/algo=<algo> of the results,
+        so that every result under root can be read back as a single dataset, see
+        common.read_arrow.
+        :param out_dir: directory of the part files
+        :param append: whether to keep the part files that are already in out_dir
+        """
+        self.out_dir = out_dir
+        Path(out_dir).mkdir(parents=True, exist_ok=True)
+
+        parts = sorted(glob(os.path.join(out_dir, 'part-*.arrow')))
+
+        if not append:
+            for part in parts:
+                os.remove(part)
+            parts = []
+
+        # index of the next part file
+        self._next_part = 1 + max((int(os.path.basename(part)[len('part-'):-len('.arrow')])
+                                   for part in parts), default=-1)
+
+    def write(self, df: pd.DataFrame):
+        """
+        Store the rows of df in a new part file.
+        """
+        if len(df) == 0:
+            return
+
+        batch = pa.RecordBatch.from_pandas(df, preserve_index=False)
+
+        filename = f'part-{self._next_part:05d}.arrow'
+        part = os.path.join(self.out_dir, filename)
+
+        # files starting with '.' are ignored by the dataset readers
+        tmp_part = os.path.join(self.out_dir, f'.{filename}.tmp')
+
+        with pa.OSFile(tmp_part, 'wb') as out_file:
+            with pa.ipc.new_file(out_file, batch.schema) as writer:
+                writer.write_batch(batch)
+
+        os.replace(tmp_part, part)
+        self._next_part += 1
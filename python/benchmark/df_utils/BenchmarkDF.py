@@ -1,17 +1,57 @@
+import os
+import csv
+import json
 import numpy as np
 import pandas as pd
 from io import TextIOWrapper
+from typing import IO, List, Set, Tuple, Union
 from ..objective import Objective
+from .ArrowSink import ArrowSink
+
+
+def to_ms(time_ns: Union[None, float]) -> float:
+    """
+    Convert nanoseconds to milliseconds. Timings that weren't measured become NaN.
+    """
+    return np.nan if time_ns is None else time_ns / 1e6
+
+
+# columns of the output csv file and of the columnar sink
+DTYPES: List[Tuple[str, type]] = [
+    ('i', np.int8),
+    ('n', np.int32),
+    ('b_low', np.int32),
+    ('b_high', np.int32),
+    ('b_sum', np.int32),
+    ('r', np.int32),
+    ('approx', np.float64),
+    ('n_calls', np.int64),
+    ('n_rounds', np.int64),
+    ('n_evals', np.int64),
+    ('n_hits', np.int64),
+    ('time_ms', np.float64),
+    ('cpu_ms', np.float64),
+    ('oracle_ms', np.float64),
+    ('overhead_ms', np.float64),
+    ('singleton_scan_ms', np.float64),
+    ('load_ms', np.float64),
+    ('peak_rss_mb', np.float64),
+    ('finished', bool),
+]
 
 
 class BenchmarkDF(object):
     def __init__(self, f: Objective, r: int, out_csv: TextIOWrapper,
-                 verbose: bool = False):
+                 verbose: bool = False, sink: Union[None, ArrowSink] = None,
+                 sidecars: Union[None, List[IO]] = None):
         """
         :param f: the integer-lattice objective function to benchmark
         :param r: cardinality constraint size
         :param opt: optimum of the maximization with cardinality constraint problem
         :param out_csv: output csv file
+        :param sink: optional columnar sink that receives a typed record batch on every write
+        :param sidecars: optional sidecar files with the per-run records of the batch, which
+                         are flushed on every write before the csv file
         """
         # size of the ground set
         self.n = f.n
@@ -24,25 +64,99 @@ class BenchmarkDF(object):
 
         self.r = r
         self.out_csv = out_csv
+        self.sink = sink
+        self.sidecars = [] if sidecars is None else sidecars
         self.verbose = verbose
 
-        self.dtypes = [
-            ('i', np.int8),
-            ('n', np.int32),
-            ('b_low', np.int32),
-            ('b_high', np.int32),
-            ('b_sum', np.int32),
-            ('r', np.int32),
-            ('approx', np.float64),
-            ('n_calls', np.int64),
-            ('time_ms', np.int64),
-        ]
+        self.dtypes = DTYPES
         
         self.buf = []
 
         self.df: pd.DataFrame = None
         self.__reset_df()
 
+    @staticmethod
+    def completed_runs(csv_filename: str) -> Set[Tuple[int, int, int, int, int]]:
+        """
+        Return the (n, b_low, b_high, r, i) keys of the runs already written to the csv file.
+        A trailing partial line left by a job that was killed while writing is truncated
+        away, so that new rows can be appended to the file.
+        Raise ValueError if the columns of the csv file aren't the current ones, e.g. if
+        it was written by an older version of the benchmark.
+        :param csv_filename: output csv file of a previous benchmark
+        """
+        if not os.path.exists(csv_filename):
+            return set()
+
+        with open(csv_filename, 'rb+') as csv_file:
+            content = csv_file.read()
+            end = content.rfind(b'\n') + 1
+
+            # new rows can only be appended under the same header, otherwise the file is
+            # left untouched
+            if end > 0:
+                columns = content[:content.find(b'\n')].decode('utf-8').strip().split(',')
+                expected_columns = [column for column, _ in DTYPES]
+
+                if columns != expected_columns:
+                    raise ValueError(f'Cannot resume {csv_filename}: its columns {columns} differ '
+                                     f'from {expected_columns}. Move it away or run without '
+                                     f'runtime.resume')
+
+            if end < len(content):
+                csv_file.truncate(end)
+
+        # there's not even a complete header
+        if end == 0:
+            return set()
+
+        df = pd.read_csv(csv_filename, usecols=['n', 'b_low', 'b_high', 'r', 'i'])
+        return set(map(tuple, df[['n', 'b_low', 'b_high', 'r', 'i']].to_numpy().tolist()))
+
+    @staticmethod
+    def repair_sidecar(filename: str, completed_runs: Set[Tuple[int, int, int, int, int]],
+                       record_key: Tuple[str, ...] = ()):
+        """
+        Prepare a sidecar file of a previous benchmark, either a csv file with a header
+        or a JSON lines file, to be resumed. Only the complete records of the runs in
+        completed_runs are kept, and only the last record with the same run and
+        record_key, e.g. ('timeout_s', ) for the anytime sidecar. The records of the other
+        runs were written by a job killed before it wrote them to the csv file, and the
+        runs are going to be run again.
+        :param filename: sidecar file of a previous benchmark
+        :param completed_runs: (n, b_low, b_high, r, i) keys returned by completed_runs
+        :param record_key: fields that tell apart the records of the same run
+        """
+        if not os.path.exists(filename):
+            return
+
+        with open(filename, 'r', encoding='utf-8', newline='') as sidecar:
+            content = sidecar.read()
+
+        # drop a trailing partial line
+        lines = content[:content.rfind('\n') + 1].splitlines(keepends=True)
+
+        is_csv = filename.endswith('.csv')
+        header, lines = (lines[:1], lines[1:]) if is_csv else ([], lines)
+        fieldnames = next(csv.reader(header)) if len(header) > 0 else []
+
+        records = dict()
+        for line in lines:
+            record = dict(zip(fieldnames, next(csv.reader([line])))) if is_csv else json.loads(line)
+            run = tuple(int(record[column]) for column in ('n', 'b_low', 'b_high', 'r', 'i'))
+
+            if run in completed_runs:
+                key = run + tuple(str(record[column]) for column in record_key)
+                records.pop(key, None)
+                records[key] = line
+
+        # replace the sidecar atomically, so that a crash leaves either version of it
+        tmp_filename = f'{filename}.tmp'
+        with open(tmp_filename, 'w', encoding='utf-8', newline='') as sidecar:
+            sidecar.writelines(header + list(records.values()))
+
+        os.replace(tmp_filename, filename)
+
     def __reset_df(self):
         self.df = pd.DataFrame(np.empty(0, dtype=self.dtypes))
 
@@ -57,34 +171,74 @@ class BenchmarkDF(object):
 
     def write(self):
         """
-        Write to the output csv file in append-mode
+        Append the buffered rows to the output csv file and to the columnar sink
         """
         if self.verbose:
             print(f'...writing to CSV...')
 
+        # the header is only written at the beginning of the csv file
         should_add_header = self.out_csv.tell() == 0
-        file_open_mode = 'a' if should_add_header else 'w'
 
-        # copy the buffer into an empty dataframe
-        self.df = self.df.append(self.buf, ignore_index=True)
+        # copy the buffer into a typed dataframe
+        self.df = pd.DataFrame(self.buf, columns=self.df.columns).astype(dict(self.dtypes))
+
+        # the csv file is the record of the completed runs, so the sink is written first. If
+        # the job is killed in between, the batch is run again when the benchmark is resumed,
+        # and common.read_arrow keeps its latest copy
+        if self.sink is not None:
+            self.sink.write(self.df)
 
-        # write to disk, appending to the file if it exists
-        self.df.to_csv(self.out_csv, mode=file_open_mode, index=False, header=should_add_header,
-                       sep=',', encoding='utf-8', decimal='.')
+        # the same holds for the records of the batch in the sidecars, which are repaired
+        # by repair_sidecar when the benchmark is resumed
+        for sidecar in self.sidecars:
+            sidecar.flush()
+
+        # write to disk after the rows written so far, so that a crash loses at most this batch.
+        # The batch is written in one go, and a partial line left by a killed job is
+        # truncated away when the benchmark is resumed
+        self.out_csv.write(self.df.to_csv(index=False, header=should_add_header,
+                                          sep=',', encoding='utf-8', decimal='.'))
+        self.out_csv.flush()
         
         # reset the dataframe and empty the buffer
         self.__reset_df()
         self.buf = []
 
     def add(self, i: int, approx: float, n_calls: int,
-            time_ns: float):
+            time_ns: float, n_evals: int = None, n_hits: int = 0, n_rounds: int = None,
+            finished: bool = True, cpu_time_ns: float = None, oracle_time_ns: float = None,
+            singleton_scan_time_ns: float = None, load_time_ns: float = None,
+            peak_rss: int = None):
         """
         Add a row to the self.df dataframe
+        :param n_calls: number of logical oracle calls
+        :param n_rounds: number of oracle round trips, where a batched oracle call counts once,
+                         defaults to n_calls
+        :param n_evals: number of oracle calls that actually evaluated f, defaults to n_calls
+        :param n_hits: number of oracle calls answered by a cache
+        :param finished: whether the run finished before its anytime budget ran out
+        :param time_ns: wall-clock time of the run
+        :param cpu_time_ns: CPU time of the run, including the worker processes of the algorithm
+        :param oracle_time_ns: wall-clock time spent in the oracle, the rest of time_ns is
+                               the overhead of the algorithm
+        :param singleton_scan_time_ns: wall-clock time spent in the singleton scan
+        :param load_time_ns: wall-clock time spent loading or generating the instances
+        :param peak_rss: peak resident set size of the run in bytes. It's the one of the process
+                         that ran the algorithm, the worker processes aren't included
+        Timings and the peak memory that weren't measured are recorded as NaN.
         """
-        time_ms = time_ns // 1_000_000
+        if n_evals is None:
+            n_evals = n_calls
+
+        if n_rounds is None:
+            n_rounds = n_calls
+
+        time_ms = to_ms(time_ns)
+        oracle_ms = to_ms(oracle_time_ns)
 
         if self.verbose:
-            print(f'\t ({i}): {approx} found in {time_ms}ms ({n_calls} oracle calls)')
+            print(f'\t ({i}): {approx} found in {time_ms:.3f}ms ({n_calls} oracle calls in {n_rounds} rounds, '
+                  f'{n_hits} cache hits{"" if finished else ", stopped early"})')
         
         # update buffer
         self.buf.append(
@@ -97,6 +251,16 @@ class BenchmarkDF(object):
                 'r': self.r,
                 'approx': approx,
                 'n_calls': n_calls,
+                'n_rounds': n_rounds,
+                'n_evals': n_evals,
+                'n_hits': n_hits,
                 'time_ms': time_ms,
+                'cpu_ms': to_ms(cpu_time_ns),
+                'oracle_ms': oracle_ms,
+                'overhead_ms': time_ms - oracle_ms,
+                'singleton_scan_ms': to_ms(singleton_scan_time_ns),
+                'load_ms': to_ms(load_time_ns),
+                'peak_rss_mb': np.nan if peak_rss is None else peak_rss / 2**20,
+                'finished': finished,
             }
         )
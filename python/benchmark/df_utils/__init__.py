@@ -1 +1,2 @@
 from .BenchmarkDF import BenchmarkDF
+from .ArrowSink import ArrowSink
@@ -0,0 +1,78 @@
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Union
+from nptyping import NDArray
+
+
+class InstanceStore(object):
+    def __init__(self, root: str):
+        """
+        Content-addressed on-disk store of objective instances.
+        Every entry is a folder named after the hash of the objective name, of its
+        parameters and of the state of the random generator used to build it.
+        It contains one raw .npy file per array, which is opened memory-mapped so that
+        parallel jobs share the same page-cached copy, and a meta.json file.
+        :param root: folder where the entries are stored
+        """
+        self.root = root
+        Path(root).mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(name: str, params: Dict[str, Any], rng_state: Dict[str, Any]) -> str:
+        """
+        Return the content address of the instances of objective name generated with
+        the given parameters, starting from the given random generator state.
+        """
+        content = json.dumps({'name': name, 'params': params, 'rng_state': rng_state},
+                             sort_keys=True)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def load(self, key: str) -> Union[None, Tuple[List[Dict[str, NDArray[Any]]], Dict[str, Any]]]:
+        """
+        Return the memory-mapped arrays of every stored instance and the metadata
+        of the entry with the given key, or None if there's no such entry.
+        """
+        entry_dir = os.path.join(self.root, key)
+        if not os.path.isdir(entry_dir):
+            return None
+
+        with open(os.path.join(entry_dir, 'meta.json'), 'r') as meta_file:
+            meta = json.load(meta_file)
+
+        instances = [
+            {
+                name: np.load(os.path.join(entry_dir, f'{i}.{name}.npy'), mmap_mode='r')
+                for name in array_names
+            }
+            for i, array_names in enumerate(meta['arrays'])
+        ]
+
+        return instances, meta
+
+    def save(self, key: str, instances: List[Dict[str, NDArray[Any]]], meta: Dict[str, Any]):
+        """
+        Atomically store the arrays of the given instances and the given metadata
+        under key. If another job stored the same key in the meantime, its entry is kept.
+        """
+        entry_dir = os.path.join(self.root, key)
+        tmp_dir = os.path.join(self.root, f'.{key}.{os.getpid()}.tmp')
+        Path(tmp_dir).mkdir(parents=True, exist_ok=True)
+
+        for i, arrays in enumerate(instances):
+            for name, array in arrays.items():
+                np.save(os.path.join(tmp_dir, f'{i}.{name}.npy'), np.asarray(array),
+                        allow_pickle=False)
+
+        meta = {**meta, 'arrays': [list(arrays.keys()) for arrays in instances]}
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w') as meta_file:
+            json.dump(meta, meta_file)
+
+        try:
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # another job already stored the same entry
+            shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -0,0 +1 @@
+from .InstanceStore import InstanceStore
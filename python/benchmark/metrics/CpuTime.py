@@ -0,0 +1,50 @@
+import time
+import resource
+
+
+class CpuTime(object):
+    def __init__(self):
+        """
+        CPU time of the current process and of its child processes since the last call
+        to reset(). The CPU time of a child process, e.g. of a forked worker of
+        BinarySearchPool, QueryPool or GreeDi, is only accounted for once the child has
+        been joined, which the pools do before the algorithms return.
+        """
+        self.reset()
+
+    @staticmethod
+    def _children_ns() -> int:
+        """
+        Return the CPU time of the terminated and joined child processes in nanoseconds.
+        """
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return int((usage.ru_utime + usage.ru_stime) * 1e9)
+
+    def reset(self):
+        """
+        Start measuring the CPU time from now.
+        """
+        self._self_start_ns = time.process_time_ns()
+        self._children_start_ns = self._children_ns()
+
+    @property
+    def self_ns(self) -> int:
+        """
+        Return the CPU time of the current process in nanoseconds.
+        """
+        return time.process_time_ns() - self._self_start_ns
+
+    @property
+    def children_ns(self) -> int:
+        """
+        Return the CPU time of the joined child processes in nanoseconds.
+        """
+        return self._children_ns() - self._children_start_ns
+
+    @property
+    def total_ns(self) -> int:
+        """
+        Return the CPU time of the current process and of its joined child processes
+        in nanoseconds.
+        """
+        return self.self_ns + self.children_ns
@@ -0,0 +1,236 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Union
+
+
+class SiteMetrics(object):
+    def __init__(self):
+        """
+        Oracle metrics of a single call site.
+        """
+        # number of oracle calls
+        self.n_calls = 0
+
+        # time spent in the oracle, in nanoseconds
+        self.time_ns = 0
+
+        # histogram of the latency of the single oracle calls. Bucket i counts the calls
+        # whose latency is in [2^(i - 1), 2^i) nanoseconds
+        self.histogram: Dict[int, int] = dict()
+
+        # histograms of the latency of the batched oracle calls, i.e. of whole batches,
+        # by batch size. Bucket j holds the batches whose size is in [2^(j - 1), 2^j),
+        # and its histogram counts them by latency as above
+        self.batch_histograms: Dict[int, Dict[int, int]] = dict()
+
+    def record(self, n_calls: int, time_ns: int):
+        """
+        Record n_calls oracle calls that took time_ns nanoseconds overall. A batch of
+        several calls is recorded as a single batch, since the latency of its calls
+        isn't known individually.
+        """
+        self.n_calls += n_calls
+        self.time_ns += time_ns
+
+        if n_calls == 1:
+            histogram = self.histogram
+        else:
+            histogram = self.batch_histograms.setdefault(n_calls.bit_length(), dict())
+
+        bucket = time_ns.bit_length()
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+
+    def merge(self, other: 'SiteMetrics'):
+        """
+        Add the oracle calls recorded by other, e.g. in a worker process.
+        """
+        self.n_calls += other.n_calls
+        self.time_ns += other.time_ns
+
+        for bucket, count in other.histogram.items():
+            self.histogram[bucket] = self.histogram.get(bucket, 0) + count
+
+        for size_bucket, other_histogram in other.batch_histograms.items():
+            histogram = self.batch_histograms.setdefault(size_bucket, dict())
+
+            for bucket, count in other_histogram.items():
+                histogram[bucket] = histogram.get(bucket, 0) + count
+
+    def to_dict(self) -> Dict:
+        """
+        Return the metrics of the call site. latency_histogram_ns only covers the single
+        oracle calls, while batch_latency_histogram_ns maps the upper bound of every batch
+        size bucket to the histogram of the latency of the whole batches.
+        """
+        return {
+            'n_calls': self.n_calls,
+            'time_ns': self.time_ns,
+            'latency_histogram_ns': {
+                2**bucket: count for bucket, count in sorted(self.histogram.items())
+            },
+            'batch_latency_histogram_ns': {
+                2**size_bucket: {
+                    2**bucket: count for bucket, count in sorted(histogram.items())
+                }
+                for size_bucket, histogram in sorted(self.batch_histograms.items())
+            },
+        }
+
+def merge_sites(sites: Dict[str, SiteMetrics], other: Dict[str, SiteMetrics]) -> Dict[str, SiteMetrics]:
+    """
+    Add the metrics of the call sites in other to the ones in sites, and return sites.
+    """
+    for name, site in other.items():
+        if name not in sites:
+            sites[name] = SiteMetrics()
+
+        sites[name].merge(site)
+
+    return sites
+
+
+class OracleMetrics(object):
+    def __init__(self, expected_calls: Union[None, int] = None,
+                 report_every_s: float = 60.0, verbose: bool = True):
+        """
+        Collect metrics about the oracle calls of an algorithm: per-call latency
+        histograms, oracle calls attributed to call sites, calls per second and ETA.
+        :param expected_calls: expected number of oracle calls, used to estimate the ETA
+        :param report_every_s: minimum number of seconds between two progress reports
+        :param verbose: whether to print the progress reports
+        """
+        self.expected_calls = expected_calls
+        self.report_every_ns = int(report_every_s * 1e9)
+        self.verbose = verbose
+        self.reset()
+
+    def reset(self):
+        """
+        Reset all the collected metrics.
+        """
+        self.n_calls = 0
+        self.sites: Dict[str, SiteMetrics] = dict()
+        self.groups: Dict[str, Dict[str, int]] = dict()
+        self._site = 'other'
+        self._t_start_ns = time.perf_counter_ns()
+        self._t_report_ns = self._t_start_ns
+
+    @contextmanager
+    def site(self, name: str) -> Iterator[None]:
+        """
+        Attribute the oracle calls performed in the with-block to the call site name.
+        """
+        prev_site = self._site
+        self._site = name
+
+        try:
+            yield
+        finally:
+            self._site = prev_site
+
+    def record(self, n_calls: int, time_ns: int):
+        """
+        Record n_calls oracle calls that took time_ns nanoseconds overall.
+        """
+        if n_calls == 0:
+            return
+
+        site = self.sites.get(self._site)
+        if site is None:
+            site = self.sites[self._site] = SiteMetrics()
+
+        site.record(n_calls, time_ns)
+        self.n_calls += n_calls
+
+        now_ns = time.perf_counter_ns()
+        if self.verbose and now_ns - self._t_report_ns >= self.report_every_ns:
+            self._t_report_ns = now_ns
+            print(self.progress())
+
+    @property
+    def current_site(self) -> str:
+        """
+        Return the call site the oracle calls are currently attributed to.
+        """
+        return self._site
+
+    def pop_sites(self) -> Dict[str, SiteMetrics]:
+        """
+        Return the metrics of every call site and clear them. A worker process pops
+        the metrics it inherited from the main process before running its tasks, and
+        sends back the ones of its own oracle calls.
+        """
+        sites = self.sites
+        self.sites = dict()
+        self.n_calls -= sum(site.n_calls for site in sites.values())
+        return sites
+
+    def merge_sites(self, sites: Dict[str, SiteMetrics]):
+        """
+        Add the metrics of the call sites recorded in a worker process.
+        """
+        merge_sites(self.sites, sites)
+        self.n_calls += sum(site.n_calls for site in sites.values())
+
+    def record_group(self, name: str, n_calls: int, n_rounds: int):
+        """
+        Record the oracle calls and round trips performed by the group name, e.g. by a
+        shard of a partitioned algorithm. Groups are reported separately from the call
+        sites, since their calls may have been performed in a worker process.
+        """
+        group = self.groups.get(name)
+        if group is None:
+            group = self.groups[name] = {'n_calls': 0, 'n_rounds': 0}
+
+        group['n_calls'] += int(n_calls)
+        group['n_rounds'] += int(n_rounds)
+
+    @property
+    def time_ns(self) -> int:
+        """
+        Return the time spent in the oracle, in nanoseconds.
+        """
+        return sum(site.time_ns for site in self.sites.values())
+
+    def site_time_ns(self, name: str) -> int:
+        """
+        Return the time spent in the oracle by the call site name, in nanoseconds.
+        """
+        site = self.sites.get(name)
+        return 0 if site is None else site.time_ns
+
+    @property
+    def elapsed_s(self) -> float:
+        return (time.perf_counter_ns() - self._t_start_ns) / 1e9
+
+    @property
+    def calls_per_s(self) -> float:
+        elapsed_s = self.elapsed_s
+        return self.n_calls / elapsed_s if elapsed_s > 0 else 0.0
+
+    @property
+    def eta_s(self) -> Union[None, float]:
+        """
+        Return the estimated number of seconds left, or None if it can't be estimated.
+        """
+        calls_per_s = self.calls_per_s
+        if self.expected_calls is None or calls_per_s == 0:
+            return None
+
+        return max(self.expected_calls - self.n_calls, 0) / calls_per_s
+
+    def progress(self) -> str:
+        eta_s = self.eta_s
+        eta = '' if eta_s is None else f'; ETA: {eta_s:.0f}s'
+        return f'Oracle calls: {self.n_calls} ({self.calls_per_s:.0f} calls/s{eta})'
+
+    def to_dict(self) -> Dict:
+        return {
+            'n_calls': self.n_calls,
+            'elapsed_s': self.elapsed_s,
+            'calls_per_s': self.calls_per_s,
+            'sites': {
+                name: site.to_dict() for name, site in sorted(self.sites.items())
+            },
+            'groups': dict(self.groups),
+        }
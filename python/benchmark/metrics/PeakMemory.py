@@ -0,0 +1,33 @@
+import sys
+import resource
+
+
+class PeakMemory(object):
+    def __init__(self):
+        """
+        Peak resident set size of the current process since the last call to reset().
+        On Linux the peak is reset through /proc/self/clear_refs, elsewhere reset() is
+        a no-op and the peak is the one since the process started. The memory of the
+        child processes isn't included, since their peak can't be reset.
+        """
+        self.reset()
+
+    def reset(self):
+        """
+        Reset the peak resident set size to the current one.
+        """
+        try:
+            with open('/proc/self/clear_refs', 'w') as clear_refs:
+                clear_refs.write('5')
+        except OSError:
+            pass
+
+    @property
+    def peak_bytes(self) -> int:
+        """
+        Return the peak resident set size in bytes.
+        """
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        # ru_maxrss is in bytes on macOS, and in kilobytes elsewhere
+        return max_rss if sys.platform == 'darwin' else max_rss * 1024
@@ -0,0 +1,3 @@
+from .CpuTime import CpuTime
+from .OracleMetrics import OracleMetrics, SiteMetrics, merge_sites
+from .PeakMemory import PeakMemory
@@ -1,8 +1,11 @@
 import networkx as nx
+import numpy as np
+import scipy.sparse as sp
 from nptyping import NDArray
-from typing import List, Tuple
-from .. import utils
+from typing import Any, Dict, List, Tuple, Union
 from .Objective import Objective
+from .IncrementalOracle import IncrementalOracle
+from .SparseVector import SparseVector
 
 
 class BudgetAllocation(Objective):
@@ -30,28 +33,163 @@ class BudgetAllocation(Objective):
 
       super().__init__(V, B, B_range)
 
-      # W[s, t] is the influence probability of channel s to customer t.
-      W = nx.adjacency_matrix(G)
+      # W[t, s] is the influence probability of channel s to customer t, stored
+      # as a (|T| x |V|) sparse matrix in CSR format.
+      W = nx.bipartite.biadjacency_matrix(G, row_order=T, column_order=V,
+                                          weight='weight', format='csr')
 
-      # collect the neighbors s \in S of each t \in T
-      neighbors: List[List[int]] = [[s for s in G.neighbors(t)] for t in T]
+      # _log_neg_p[t, s] = log(1 - p(s, t)) for each neighbor s \in S of each t \in T.
+      # 1 - p(s, t) is clipped away from 0 so that 0 * log(1 - p(s, t)) = 0 when p(s, t) = 1.
+      self._log_neg_p = W.astype(float)
+      self._log_neg_p.data = np.log(np.maximum(1 - self._log_neg_p.data, np.finfo(float).tiny))
 
-      # keep track of (1 - p(s, t), s) for each neighbors s \in S of each t \in T
-      self.probs_exp_list: List[List[Tuple[float, int]]] = [
-        [(1 - W[s, t], s) for s in s_neighbors]
-        for s_neighbors, t in zip(neighbors, T)
-      ]
+      # column-major copy of the same matrix, used to access the customers t
+      # adjacent to each channel s in O(deg(s))
+      self._log_neg_p_csc = self._log_neg_p.tocsc()
 
-    def value(self, x: NDArray[int]) -> float:
+    def arrays(self) -> Dict[str, NDArray[Any]]:
+        """
+        Return B and both the CSR and CSC layouts of log(1 - p(s, t)).
+        """
+        return {
+            'V': np.asarray(self.V),
+            'B': self.B,
+            'shape': np.asarray(self._log_neg_p.shape),
+            'log_neg_p_data': self._log_neg_p.data,
+            'log_neg_p_indices': self._log_neg_p.indices,
+            'log_neg_p_indptr': self._log_neg_p.indptr,
+            'log_neg_p_csc_data': self._log_neg_p_csc.data,
+            'log_neg_p_csc_indices': self._log_neg_p_csc.indices,
+            'log_neg_p_csc_indptr': self._log_neg_p_csc.indptr,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, NDArray[Any]],
+                    B_range: Tuple[int, int]) -> 'BudgetAllocation':
+        """
+        Rebuild the Budget Allocation objective without touching the original graph.
+        """
+        f = cls.__new__(cls)
+        Objective.__init__(f, arrays['V'].tolist(), arrays['B'], B_range)
+
+        shape = tuple(arrays['shape'])
+        f._log_neg_p = sp.csr_matrix((arrays['log_neg_p_data'], arrays['log_neg_p_indices'],
+                                      arrays['log_neg_p_indptr']), shape=shape)
+        f._log_neg_p_csc = sp.csc_matrix((arrays['log_neg_p_csc_data'],
+                                          arrays['log_neg_p_csc_indices'],
+                                          arrays['log_neg_p_csc_indptr']), shape=shape)
+        return f
+
+    def value(self, x: Union[NDArray[int], SparseVector]) -> float:
         """
         Value oracle for the Budget Allocation problem.
-        :param x: allotted budget.
+        :param x: allotted budget, either dense or sparse.
+                  Sparse vectors only touch the channels s with x[s] > 0.
         :return: expected number of influenced people
         """
         super().value(x)
-        return sum((
-          1 - utils.prod(
-            neg_p_st ** x[s]
-            for neg_p_st, s in probs_exp
-          ) for probs_exp in self.probs_exp_list
-        )) 
+
+        # log_prods[t] = log(prod_s (1 - p(s, t))^x[s])
+        if isinstance(x, SparseVector):
+            L = self._log_neg_p_csc[:, x.indices]
+            self._count_work(L.nnz)
+            log_prods = L @ x.counts
+        else:
+            self._count_work(self._log_neg_p.nnz)
+            log_prods = self._log_neg_p @ x
+
+        return np.sum(1 - np.exp(log_prods))
+
+    def value_batch(self, X: NDArray[(Any, Any), int]) -> NDArray[float]:
+        """
+        Batched value oracle for the Budget Allocation problem.
+        :param X: (m, n) matrix of allotted budgets.
+        :return: expected number of influenced people for each row of X
+        """
+        self._count_calls(len(X))
+        self._count_work(self._log_neg_p.nnz * len(X))
+
+        # log_prods[t, i] = log(prod_s (1 - p(s, t))^X[i, s])
+        log_prods = self._log_neg_p @ X.T
+        return np.sum(1 - np.exp(log_prods), axis=0)
+
+    def incremental(self, x: Union[None, NDArray[int]] = None) -> IncrementalOracle:
+        """
+        Return a stateful value oracle for the Budget Allocation problem that answers
+        f(x + k * 1_e) queries in O(deg(e)).
+        :param x: initial committed vector. If None, x starts from the zero vector
+        """
+        return BudgetAllocationOracle(self, x)
+
+
+class BudgetAllocationOracle(IncrementalOracle):
+    def __init__(self, f: BudgetAllocation, x: Union[None, NDArray[int]] = None):
+        """
+        Incremental value oracle for the Budget Allocation problem.
+        For the committed vector x, it keeps track of log(prod_s (1 - p(s, t))^x[s])
+        for every customer t, so that f(x + k * 1_e) only touches the customers
+        adjacent to channel e.
+        :param f: Budget Allocation objective
+        :param x: initial committed vector. If None, x starts from the zero vector
+        """
+        self.f = f
+
+        if x is None:
+            self._x = f.zeros()
+            self._log_prods = np.zeros((f._log_neg_p.shape[0], ))
+            self._value = 0
+        else:
+            f._count_calls()
+            f._count_work(f._log_neg_p.nnz)
+            self._x = np.array(f.dense(x), dtype=f.dtype)
+            self._log_prods = f._log_neg_p @ self._x
+            self._value = np.sum(1 - np.exp(self._log_prods))
+
+    def _neighbors(self, e: int) -> Tuple[NDArray[int], NDArray[float]]:
+        """
+        Return the customers t adjacent to channel e and the corresponding log(1 - p(e, t)).
+        The edges (e, t) count as touched.
+        """
+        L = self.f._log_neg_p_csc
+        start, end = L.indptr[e], L.indptr[e + 1]
+        self.f._count_work(end - start)
+        return L.indices[start:end], L.data[start:end]
+
+    def _gain(self, e: int, k: int) -> float:
+        """
+        Return f(x + k * 1_e) - f(x) without counting an oracle call.
+        """
+        T_e, log_neg_p_e = self._neighbors(e)
+        return np.sum(np.exp(self._log_prods[T_e]) * (1 - np.exp(k * log_neg_p_e)))
+
+    def value_step(self, e: int, k: int) -> float:
+        """
+        Value oracle for f(x + k * 1_e) in O(deg(e)).
+        """
+        self.f._count_calls()
+        return self._value + self._gain(e, k)
+
+    def value_steps(self, E: NDArray[int],
+                    K: Union[int, NDArray[int]]) -> NDArray[(Any, ), float]:
+        """
+        Batched value oracle for f(x + K[i] * 1_{E[i]}) for each step (E[i], K[i]).
+        """
+        E = np.asarray(E)
+        K = np.broadcast_to(K, E.shape)
+        self.f._count_calls(len(E))
+
+        # L_E[t, i] = log(1 - p(E[i], t))
+        L_E = self.f._log_neg_p_csc[:, E].tocoo()
+        self.f._count_work(L_E.nnz)
+        gains = np.exp(self._log_prods[L_E.row]) * (1 - np.exp(K[L_E.col] * L_E.data))
+        return self._value + np.bincount(L_E.col, weights=gains, minlength=len(E))
+
+    def commit(self, e: int, k: int, value: float):
+        """
+        Commit the step x <- x + k * 1_e, updating the customers adjacent to e.
+        """
+        self._value += self._gain(e, k)
+        self._x[e] += k
+
+        T_e, log_neg_p_e = self._neighbors(e)
+        self._log_prods[T_e] += k * log_neg_p_e
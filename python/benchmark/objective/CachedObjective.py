@@ -0,0 +1,215 @@
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Union
+from nptyping import NDArray
+from .Objective import Objective
+from .IncrementalOracle import IncrementalOracle
+from .SparseVector import SparseVector
+
+
+class CachedObjective(Objective):
+    def __init__(self, f: Objective, max_size: int, seed: int = 0):
+        """
+        Memoizing wrapper around an integer-lattice submodular function f.
+        Values are cached in a LRU cache with at most max_size entries, keyed by
+        the linear hash h(x) = sum_e x[e] * R[e] mod 2^64 of the integer vector x,
+        where R is a vector of random 64-bit integers. Since h is linear,
+        h(x + k * 1_e) = h(x) + k * R[e] is computed in O(1) from the hash of a
+        committed vector x.
+        n_calls counts the logical oracle calls, n_evals counts the calls that
+        actually evaluated f, and n_hits counts the calls answered by the cache.
+        :param f: integer-lattice submodular function to wrap
+        :param max_size: maximum number of cached values
+        :param seed: seed of the random hash coefficients R
+        """
+        super().__init__(f.V, f.B, f.B_range)
+        self.f = f
+        self.max_size = max_size
+
+        # random coefficients of the linear hash
+        self._R = np.random.default_rng(seed).integers(low=0, high=2**64, size=(f.n, ),
+                                                        dtype=np.uint64, endpoint=False)
+
+        self._cache: 'OrderedDict[int, float]' = OrderedDict()
+        self._n_hits = 0
+
+    @property
+    def n_evals(self) -> int:
+        """
+        Return the number of oracle calls that actually evaluated f
+        """
+        return self.f.n_evals
+
+    @property
+    def n_work(self) -> int:
+        """
+        Return the objective-specific work performed by f
+        """
+        return self.f.n_work
+
+    @property
+    def n_hits(self) -> int:
+        """
+        Return the number of oracle calls answered by the cache
+        """
+        return self._n_hits
+
+    def hash(self, x: Union[NDArray[int], SparseVector]) -> int:
+        """
+        Return the linear hash h(x) of the integer vector x.
+        """
+        if isinstance(x, SparseVector):
+            return int(np.sum(x.counts.astype(np.uint64) * self._R[x.indices], dtype=np.uint64))
+
+        return int(np.sum(x.astype(np.uint64) * self._R, dtype=np.uint64))
+
+    def step_hash(self, h: int, e: int, k: int) -> int:
+        """
+        Return the hash of x + k * 1_e, given the hash h of x.
+        """
+        return (h + int(k) * int(self._R[e])) % 2**64
+
+    def lookup(self, key: int) -> Union[None, float]:
+        """
+        Return the cached value for the given key, or None if it's not cached.
+        A successful lookup counts as a cache hit.
+        """
+        value = self._cache.get(key)
+
+        if value is not None:
+            self._cache.move_to_end(key)
+            self._n_hits += 1
+
+        return value
+
+    def store(self, key: int, value: float):
+        """
+        Cache the given value, evicting the least recently used one if needed.
+        """
+        self._cache[key] = value
+
+        if len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def value(self, x: Union[NDArray[int], SparseVector]) -> float:
+        """
+        Value oracle that evaluates f only on cache misses.
+        """
+        super().value(x)
+        key = self.hash(x)
+        value = self.lookup(key)
+
+        if value is None:
+            value = self.f.value(x)
+            self.store(key, value)
+
+        return value
+
+    def value_batch(self, X: NDArray[(Any, Any), int]) -> NDArray[float]:
+        """
+        Batched value oracle that evaluates f only on the rows that are not cached.
+        """
+        self._count_calls(len(X))
+        keys = [self.hash(x) for x in X]
+        values = np.array([self.lookup(key) for key in keys], dtype=float)
+        misses = np.flatnonzero(np.isnan(values))
+
+        if len(misses) > 0:
+            values[misses] = self.f.value_batch(X[misses])
+
+            for i in misses:
+                self.store(keys[i], values[i])
+
+        return values
+
+    def incremental(self, x: Union[None, NDArray[int]] = None) -> IncrementalOracle:
+        """
+        Return a stateful value oracle that answers f(x + k * 1_e) queries from
+        the cache, falling back to the incremental oracle of f on cache misses.
+        :param x: initial committed vector. If None, x starts from the zero vector
+        """
+        return CachedOracle(self, x)
+
+    def reset(self):
+        """
+        Reset the number of oracle calls to zero and empty the cache.
+        """
+        super().reset()
+        self.f.reset()
+        self._cache.clear()
+        self._n_hits = 0
+
+
+class CachedOracle(IncrementalOracle):
+    def __init__(self, f: CachedObjective, x: Union[None, NDArray[int]] = None):
+        """
+        Incremental value oracle backed by the cache of f.
+        :param f: cached objective
+        :param x: initial committed vector. If None, x starts from the zero vector
+        """
+        self.f = f
+
+        if x is not None:
+            f._count_calls()
+
+        # incremental oracle of the wrapped objective
+        self._oracle = f.f.incremental(x)
+
+        # hash of the committed vector x
+        self._h = f.hash(self._oracle.x)
+
+    @property
+    def x(self) -> NDArray[int]:
+        """
+        Return the committed vector x. It must not be modified in place.
+        """
+        return self._oracle.x
+
+    @property
+    def value(self) -> float:
+        """
+        Return f(x) for the committed vector x.
+        """
+        return self._oracle.value
+
+    def value_step(self, e: int, k: int) -> float:
+        """
+        Value oracle for f(x + k * 1_e) that evaluates f only on cache misses.
+        """
+        self.f._count_calls()
+        key = self.f.step_hash(self._h, e, k)
+        value = self.f.lookup(key)
+
+        if value is None:
+            value = self._oracle.value_step(e, k)
+            self.f.store(key, value)
+
+        return value
+
+    def value_steps(self, E: NDArray[int],
+                    K: Union[int, NDArray[int]]) -> NDArray[(Any, ), float]:
+        """
+        Batched value oracle for f(x + K[i] * 1_{E[i]}) that evaluates f only
+        on the steps that are not cached.
+        """
+        E = np.asarray(E)
+        K = np.broadcast_to(K, E.shape)
+        self.f._count_calls(len(E))
+        keys = [self.f.step_hash(self._h, e, k) for e, k in zip(E, K)]
+        values = np.array([self.f.lookup(key) for key in keys], dtype=float)
+        misses = np.flatnonzero(np.isnan(values))
+
+        if len(misses) > 0:
+            values[misses] = self._oracle.value_steps(E[misses], K[misses])
+
+            for i in misses:
+                self.f.store(keys[i], values[i])
+
+        return values
+
+    def commit(self, e: int, k: int, value: float):
+        """
+        Commit the step x <- x + k * 1_e.
+        """
+        self._oracle.commit(e, k, value)
+        self._h = self.f.step_hash(self._h, e, k)
@@ -1,10 +1,10 @@
 import numpy as np
 from typing import Tuple
 from nptyping import NDArray
-from .Objective import Objective
+from .ModularObjective import ModularObjective
 
 
-class DemoMonotone(Objective):
+class DemoMonotone(ModularObjective):
     def __init__(self, rng: np.random.Generator, n: int, B: NDArray[int], B_range: Tuple[int, int]):
         """
         Generate a random integer-lattice modular, monotone function
@@ -20,10 +20,3 @@ class DemoMonotone(Objective):
         # generate n random weights sorted in ascending order
         self.w = rng.integers(low=0, high=100, size=n)
         np.sort(self.w)
-
-    def value(self, x: NDArray[int]) -> int:
-        """
-        Value oracle for demo monotone maximization
-        """
-        super().value(x)
-        return x @ self.w
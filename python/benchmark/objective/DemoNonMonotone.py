@@ -1,10 +1,10 @@
 import numpy as np
 from typing import Tuple
 from nptyping import NDArray
-from .Objective import Objective
+from .ModularObjective import ModularObjective
 
 
-class DemoNonMonotone(Objective):
+class DemoNonMonotone(ModularObjective):
     def __init__(self, rng: np.random.Generator, n: int, B: NDArray[int], B_range: Tuple[int, int]):
         """
         Generate a random integer-lattice modular, non-monotone function
@@ -19,10 +19,3 @@ class DemoNonMonotone(Objective):
 
         # generate n random weights
         self.w = rng.integers(low=-100, high=100, size=n)
-
-    def value(self, x: NDArray[int]) -> int:
-        """
-        Value oracle for demo non-monotone maximization
-        """
-        super().value(x)
-        return x @ self.w
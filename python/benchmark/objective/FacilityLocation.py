@@ -1,12 +1,20 @@
 import networkx as nx
 import numpy as np
+import scipy.sparse as sp
 from nptyping import NDArray
-from typing import List
+from typing import Any, Dict, List, Tuple, Union
 from .Objective import Objective
+from .IncrementalOracle import IncrementalOracle
+from .SparseVector import SparseVector
+
+
+# the weight matrix is stored as a dense array when at least this fraction of
+# its entries is non-zero, and as a CSR sparse matrix otherwise
+DENSITY_THRESHOLD = 0.1
 
 
 class FacilityLocation(Objective):
-    def __init__(self, G: nx.Graph, B: NDArray[int]):
+    def __init__(self, G: nx.Graph, B: NDArray[int], B_range: Tuple[int, int]):
         """
         Generate an integer-lattice smodular, monotone function for the
         facility location problem.
@@ -21,23 +29,258 @@ class FacilityLocation(Objective):
         V: List[int] = [n for n in G.nodes if G.nodes[n]['bipartite'] == 0]
         T: List[int] = [m for m in G.nodes if G.nodes[m]['bipartite'] == 1]
 
-        super().__init__(V, B)
-        self.W = nx.adjacency_matrix(G)
+        super().__init__(V, B, B_range)
+
+        # W[t, s] is the weight of facility s for customer t, i.e. the (|T| * |S|)
+        # weight matrix. It's materialized only once, in a layout chosen by density.
+        W = nx.bipartite.biadjacency_matrix(G, row_order=T, column_order=V,
+                                            weight='weight', format='csr').astype(float)
+        density = W.nnz / max(W.shape[0] * W.shape[1], 1)
+        self.is_dense = density >= DENSITY_THRESHOLD
+        self.W = W.toarray() if self.is_dense else W
+
+        # column-major copy of the weight matrix, used to access the customers t
+        # served by each facility s
+        self._W_csc = W.tocsc()
 
         # list of target customers
         self.T = T
 
-    def value(self, x: NDArray[int]) -> float:
+    def arrays(self) -> Dict[str, NDArray[Any]]:
+        """
+        Return B and the CSC layout of the weight matrix.
+        """
+        return {
+            'V': np.asarray(self.V),
+            'T': np.asarray(self.T),
+            'B': self.B,
+            'shape': np.asarray(self._W_csc.shape),
+            'W_csc_data': self._W_csc.data,
+            'W_csc_indices': self._W_csc.indices,
+            'W_csc_indptr': self._W_csc.indptr,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, NDArray[Any]],
+                    B_range: Tuple[int, int]) -> 'FacilityLocation':
+        """
+        Rebuild the facility location objective without touching the original graph.
+        """
+        f = cls.__new__(cls)
+        Objective.__init__(f, arrays['V'].tolist(), arrays['B'], B_range)
+
+        f._W_csc = sp.csc_matrix((arrays['W_csc_data'], arrays['W_csc_indices'],
+                                  arrays['W_csc_indptr']), shape=tuple(arrays['shape']))
+        density = f._W_csc.nnz / max(f._W_csc.shape[0] * f._W_csc.shape[1], 1)
+        f.is_dense = density >= DENSITY_THRESHOLD
+        f.W = f._W_csc.toarray() if f.is_dense else f._W_csc.tocsr()
+        f.T = arrays['T'].tolist()
+        return f
+
+    def scale(self, x: NDArray[int],
+              B: Union[None, NDArray[int]] = None) -> NDArray[float]:
+        """
+        Return the scaling factor x * sqrt(1 - x + B) / B of each facility.
+        :param x: scale of the facilities
+        :param B: upper bounds of the given facilities, defaults to self.B
+        """
+        B = self.B if B is None else B
+        return x * np.sqrt(1 - x + B) / B
+
+    def contributions(self, g: NDArray[float],
+                      rows: Union[None, NDArray[int]] = None) -> NDArray[(Any, Any), float]:
+        """
+        Return the dense (|rows| * |S|) matrix M[t, s] = W[t, s] * g[s].
+        :param g: scaling factor of each facility
+        :param rows: customers to consider, defaults to all of them
+        """
+        W = self.W if rows is None else self.W[rows]
+
+        if self.is_dense:
+            return W * g
+
+        return (W @ sp.diags(g)).toarray()
+
+    def value(self, x: Union[NDArray[int], SparseVector]) -> float:
         """
         Value oracle for the facility location problem.
-        :param x: scale of all facilities
+        :param x: scale of all facilities, either dense or sparse.
+                  Sparse vectors only touch the facilities that are open.
         """
         super().value(x)
 
-        # W_st is the (|S| * |T|) weight matrix
-        W_st = np.array([[self.W[s, t] for s in self.V] for t in self.T])
+        if isinstance(x, SparseVector):
+            if x.nnz == 0:
+                return 0
+
+            W = self._W_csc[:, x.indices]
+            self._count_work(W.nnz)
+            M = (W @ sp.diags(self.scale(x.counts, self.B[x.indices]))).toarray()
+            return np.sum(np.max(M, axis=1))
 
-        # m is the application of p_st to W_st
-        M = x * W_st * np.sqrt(1 - x + self.B) / self.B
+        self._count_work(self._W_csc.nnz)
+
+        # M is the application of p_st to W_st
+        M = self.contributions(self.scale(x))
 
         return np.sum(np.max(M, axis=1))
+
+    def value_batch(self, X: NDArray[(Any, Any), int]) -> NDArray[float]:
+        """
+        Batched value oracle for the facility location problem.
+        :param X: (m, n) matrix whose rows are the scales of all facilities
+        """
+        self._count_calls(len(X))
+        self._count_work(self._W_csc.nnz * len(X))
+
+        # G[i, s] is the scaling factor of facility s in the i-th candidate
+        G = self.scale(X)
+
+        if not self.is_dense:
+            return np.array([np.sum(np.max(self.contributions(g), axis=1)) for g in G])
+
+        # M[i, t, s] is the application of p_st to W_st for the i-th candidate
+        M = G[:, np.newaxis, :] * self.W[np.newaxis, :, :]
+
+        return np.sum(np.max(M, axis=2), axis=1)
+
+    def incremental(self, x: Union[None, NDArray[int]] = None) -> IncrementalOracle:
+        """
+        Return a stateful value oracle for the facility location problem that
+        answers f(x + k * 1_e) queries by only touching the customers of e.
+        :param x: initial committed vector. If None, x starts from the zero vector
+        """
+        return FacilityLocationOracle(self, x)
+
+
+class FacilityLocationOracle(IncrementalOracle):
+    def __init__(self, f: FacilityLocation, x: Union[None, NDArray[int]] = None):
+        """
+        Incremental value oracle for the facility location problem.
+        For the committed vector x, it keeps track of the best and second-best
+        facility contribution of each customer t, so that f(x + k * 1_e) only
+        touches the customers served by facility e.
+        :param f: facility location objective
+        :param x: initial committed vector. If None, x starts from the zero vector
+        """
+        self.f = f
+        n_customers = len(f.T)
+
+        if x is None:
+            self._x = f.zeros()
+            self._g = np.zeros((f.n, ))
+
+            # no facility is open, every customer gets a contribution of 0
+            self._best = np.zeros((n_customers, ))
+            self._arg_best = np.full((n_customers, ), -1)
+            self._second = np.zeros((n_customers, ))
+            self._value = 0
+        else:
+            f._count_calls()
+            f._count_work(f._W_csc.nnz)
+            self._x = np.array(f.dense(x), dtype=f.dtype)
+            self._g = f.scale(self._x)
+            self._best = np.empty((n_customers, ))
+            self._arg_best = np.empty((n_customers, ), dtype=int)
+            self._second = np.empty((n_customers, ))
+            self._update_customers(np.arange(n_customers))
+            self._value = np.sum(self._best)
+
+    def _customers(self, e: int) -> Tuple[NDArray[int], NDArray[float]]:
+        """
+        Return the customers t served by facility e and the corresponding weights W[t, e].
+        The edges (e, t) count as touched.
+        """
+        W = self.f._W_csc
+        start, end = W.indptr[e], W.indptr[e + 1]
+        self.f._count_work(end - start)
+        return W.indices[start:end], W.data[start:end]
+
+    def _update_customers(self, rows: NDArray[int]):
+        """
+        Recompute the best and second-best contribution of the given customers.
+        """
+        if not self.f.is_dense:
+            self._update_customers_sparse(rows)
+            return
+
+        M = self.f.contributions(self._g, rows)
+        arange = np.arange(len(rows))
+
+        arg_best = np.argmax(M, axis=1)
+        self._best[rows] = M[arange, arg_best]
+        self._arg_best[rows] = arg_best
+
+        M[arange, arg_best] = -np.inf
+        self._second[rows] = np.max(M, axis=1) if M.shape[1] > 1 else -np.inf
+
+    def _update_customers_sparse(self, rows: NDArray[int]):
+        """
+        Recompute the best and second-best contribution of the given customers from the
+        sparse rows of W, in O(nnz(W[rows]) * log(nnz(W[rows]))) rather than O(|rows| * |S|).
+        The contributions that aren't stored are 0, and every contribution is non-negative.
+        """
+        W = self.f.W[rows]
+        counts = np.diff(W.indptr)
+        start = W.indptr[:-1]
+
+        # sort the contributions of every row in decreasing order, keeping the rows in place
+        data = W.data * self._g[W.indices]
+        order = np.lexsort((-data, np.repeat(np.arange(len(rows)), counts)))
+        data, indices = data[order], W.indices[order]
+
+        # customers without any stored contribution aren't served by any facility
+        has_best = counts > 0
+        best = np.zeros((len(rows), ))
+        arg_best = np.full((len(rows), ), -1)
+        best[has_best] = data[start[has_best]]
+        arg_best[has_best] = indices[start[has_best]]
+
+        # customers with a single stored contribution get 0 from any other facility
+        has_second = counts > 1
+        second = np.full((len(rows), ), 0.0 if self.f.n > 1 else -np.inf)
+        second[has_second] = data[start[has_second] + 1]
+
+        self._best[rows] = best
+        self._arg_best[rows] = arg_best
+        self._second[rows] = second
+
+    def _gain(self, e: int, k: int) -> float:
+        """
+        Return f(x + k * 1_e) - f(x) without counting an oracle call.
+        """
+        T_e, w_e = self._customers(e)
+        g_e = self.f.scale(self._x[e] + k, self.f.B[e])
+
+        # best contribution of each customer of e without considering e itself
+        others = np.where(self._arg_best[T_e] == e, self._second[T_e], self._best[T_e])
+        return np.sum(np.maximum(w_e * g_e, others) - self._best[T_e])
+
+    def value_step(self, e: int, k: int) -> float:
+        """
+        Value oracle for f(x + k * 1_e) in O(deg(e)).
+        """
+        self.f._count_calls()
+        return self._value + self._gain(e, k)
+
+    def value_steps(self, E: NDArray[int],
+                    K: Union[int, NDArray[int]]) -> NDArray[(Any, ), float]:
+        """
+        Batched value oracle for f(x + K[i] * 1_{E[i]}) for each step (E[i], K[i]).
+        """
+        E = np.asarray(E)
+        K = np.broadcast_to(K, E.shape)
+        self.f._count_calls(len(E))
+        return self._value + np.array([self._gain(e, k) for e, k in zip(E, K)])
+
+    def commit(self, e: int, k: int, value: float):
+        """
+        Commit the step x <- x + k * 1_e, updating the customers served by e.
+        """
+        self._x[e] += k
+        self._g[e] = self.f.scale(self._x[e], self.f.B[e])
+
+        T_e, _ = self._customers(e)
+        prev_best = self._best[T_e]
+        self._update_customers(T_e)
+        self._value += np.sum(self._best[T_e] - prev_best)
@@ -0,0 +1,81 @@
+import numpy as np
+from contextlib import AbstractContextManager
+from typing import Any, Union
+from nptyping import NDArray
+
+
+class IncrementalOracle(object):
+    def __init__(self, f: 'Objective', x: Union[None, NDArray[int]] = None):
+        """
+        Stateful value oracle of an integer-lattice submodular function f.
+        It keeps track of a committed vector x and of f(x), and it answers
+        f(x + k * 1_e) queries for the steps (e, k) the algorithms are interested in.
+        This default implementation evaluates f on x itself, applying and rolling
+        back each step in place, objectives that can answer such queries faster
+        override Objective.incremental().
+        :param f: integer-lattice submodular function
+        :param x: initial committed vector. If None, x starts from the zero vector
+                  and f is assumed to be normalized, i.e. f(0) = 0
+        """
+        self.f = f
+
+        if x is None:
+            self._x = f.zeros()
+            self._value = 0
+        else:
+            self._x = np.array(f.dense(x), dtype=f.dtype)
+            self._value = f.value(self._x)
+
+    @property
+    def x(self) -> NDArray[int]:
+        """
+        Return the committed vector x. It must not be modified in place.
+        """
+        return self._x
+
+    @property
+    def value(self) -> float:
+        """
+        Return f(x) for the committed vector x.
+        """
+        return self._value
+
+    def call_site(self, name: str) -> AbstractContextManager:
+        """
+        Return a context manager that attributes the oracle calls performed within it
+        to the call site name. See Objective.call_site().
+        """
+        return self.f.call_site(name)
+
+    def value_step(self, e: int, k: int) -> float:
+        """
+        Value oracle for f(x + k * 1_e). It counts as a single oracle call.
+        :param e: coordinate of the step
+        :param k: number of copies of e to add to x
+        """
+        self._x[e] += k
+
+        try:
+            return self.f.value(self._x)
+        finally:
+            self._x[e] -= k
+
+    def value_steps(self, E: NDArray[int],
+                    K: Union[int, NDArray[int]]) -> NDArray[(Any, ), float]:
+        """
+        Batched value oracle for f(x + K[i] * 1_{E[i]}) for each step (E[i], K[i]).
+        Every step counts as a separate oracle call.
+        :param E: coordinates of the steps
+        :param K: number of copies added in each step, either a scalar or one per step
+        """
+        return self.f.value_batch_steps(self._x, E, K)
+
+    def commit(self, e: int, k: int, value: float):
+        """
+        Commit the step x <- x + k * 1_e. It does not count as an oracle call.
+        :param e: coordinate of the step
+        :param k: number of copies of e to add to x
+        :param value: f(x + k * 1_e), as previously returned by value_step
+        """
+        self._x[e] += k
+        self._value = value
@@ -0,0 +1,192 @@
+import time
+import numpy as np
+from contextlib import AbstractContextManager
+from typing import Any, Dict, Union
+from nptyping import NDArray
+from .Objective import Objective
+from .IncrementalOracle import IncrementalOracle
+from .SparseVector import SparseVector
+from ..metrics import OracleMetrics, SiteMetrics
+
+
+class InstrumentedObjective(Objective):
+    def __init__(self, f: Objective, metrics: OracleMetrics):
+        """
+        Wrapper around an integer-lattice submodular function f that records the
+        latency of every oracle call, as well as the call site it comes from, in metrics.
+        Oracle calls are still counted by f, so wrapping f doesn't change n_calls.
+        :param f: integer-lattice submodular function to instrument
+        :param metrics: metrics collector
+        """
+        super().__init__(f.V, f.B, f.B_range)
+        self.f = f
+        self.metrics = metrics
+
+    @property
+    def n_calls(self) -> int:
+        """
+        Return the number of oracle calls of f
+        """
+        return self.f.n_calls
+
+    @property
+    def n_rounds(self) -> int:
+        """
+        Return the number of oracle round trips of f
+        """
+        return self.f.n_rounds
+
+    @property
+    def n_evals(self) -> int:
+        """
+        Return the number of oracle calls that actually evaluated f
+        """
+        return self.f.n_evals
+
+    @property
+    def n_hits(self) -> int:
+        """
+        Return the number of oracle calls of f answered by a cache
+        """
+        return self.f.n_hits
+
+    @property
+    def n_work(self) -> int:
+        """
+        Return the objective-specific work performed by f
+        """
+        return self.f.n_work
+
+    def _count_calls(self, k: int = 1, rounds: int = 1):
+        """
+        Increment the number of oracle calls and round trips of f.
+        """
+        self.f._count_calls(k, rounds)
+
+    def call_site(self, name: str) -> AbstractContextManager:
+        """
+        Attribute the oracle calls performed within the returned context to name.
+        """
+        return self.metrics.site(name)
+
+    def current_call_site(self) -> Union[None, str]:
+        """
+        Return the call site the oracle calls are currently attributed to.
+        """
+        return self.metrics.current_site
+
+    def _pop_site_metrics(self) -> Dict[str, SiteMetrics]:
+        """
+        Return and clear the per-call-site metrics.
+        """
+        return self.metrics.pop_sites()
+
+    def _merge_site_metrics(self, sites: Dict[str, SiteMetrics]):
+        """
+        Add the per-call-site metrics recorded by a worker process.
+        """
+        self.metrics.merge_sites(sites)
+
+    def record_group(self, name: str, n_calls: int, n_rounds: int):
+        """
+        Record the oracle calls performed by the group name in metrics.
+        """
+        self.metrics.record_group(name, n_calls, n_rounds)
+
+    def value(self, x: Union[NDArray[int], SparseVector]) -> float:
+        """
+        Value oracle that records the latency of f.value.
+        """
+        t_start = time.perf_counter_ns()
+        value = self.f.value(x)
+        self.metrics.record(1, time.perf_counter_ns() - t_start)
+        return value
+
+    def value_batch(self, X: NDArray[(Any, Any), int]) -> NDArray[float]:
+        """
+        Batched value oracle that records the latency of f.value_batch.
+        """
+        t_start = time.perf_counter_ns()
+        values = self.f.value_batch(X)
+        self.metrics.record(len(X), time.perf_counter_ns() - t_start)
+        return values
+
+    def value_batch_steps(self, x: NDArray[int], E: NDArray[int],
+                          K: Union[int, NDArray[int]]) -> NDArray[float]:
+        """
+        Batched value oracle for f(x + K[i] * 1_{E[i]}) that records its latency.
+        """
+        t_start = time.perf_counter_ns()
+        values = self.f.value_batch_steps(x, E, K)
+        self.metrics.record(len(values), time.perf_counter_ns() - t_start)
+        return values
+
+    def incremental(self, x: Union[None, NDArray[int]] = None) -> IncrementalOracle:
+        """
+        Return a stateful value oracle that records the latency of the incremental
+        oracle of f.
+        """
+        return InstrumentedOracle(self, x)
+
+    def reset(self):
+        """
+        Reset the number of oracle calls of f to zero and clear the metrics.
+        """
+        super().reset()
+        self.f.reset()
+        self.metrics.reset()
+
+
+class InstrumentedOracle(IncrementalOracle):
+    def __init__(self, f: InstrumentedObjective, x: Union[None, NDArray[int]] = None):
+        """
+        Incremental value oracle that records the latency of the queries answered
+        by the incremental oracle of the wrapped objective.
+        :param f: instrumented objective
+        :param x: initial committed vector. If None, x starts from the zero vector
+        """
+        self.f = f
+
+        t_start = time.perf_counter_ns()
+        self._oracle = f.f.incremental(x)
+        if x is not None:
+            f.metrics.record(1, time.perf_counter_ns() - t_start)
+
+    @property
+    def x(self) -> NDArray[int]:
+        """
+        Return the committed vector x. It must not be modified in place.
+        """
+        return self._oracle.x
+
+    @property
+    def value(self) -> float:
+        """
+        Return f(x) for the committed vector x.
+        """
+        return self._oracle.value
+
+    def value_step(self, e: int, k: int) -> float:
+        """
+        Value oracle for f(x + k * 1_e) that records its latency.
+        """
+        t_start = time.perf_counter_ns()
+        value = self._oracle.value_step(e, k)
+        self.f.metrics.record(1, time.perf_counter_ns() - t_start)
+        return value
+
+    def value_steps(self, E: NDArray[int],
+                    K: Union[int, NDArray[int]]) -> NDArray[(Any, ), float]:
+        """
+        Batched value oracle for f(x + K[i] * 1_{E[i]}) that records its latency.
+        """
+        t_start = time.perf_counter_ns()
+        values = self._oracle.value_steps(E, K)
+        self.f.metrics.record(len(values), time.perf_counter_ns() - t_start)
+        return values
+
+    def commit(self, e: int, k: int, value: float):
+        """
+        Commit the step x <- x + k * 1_e.
+        """
+        self._oracle.commit(e, k, value)
@@ -0,0 +1,112 @@
+import numpy as np
+from typing import Any, Dict, List, Tuple, Union
+from nptyping import NDArray
+from .Objective import Objective
+from .IncrementalOracle import IncrementalOracle
+from .SparseVector import SparseVector
+
+
+class ModularObjective(Objective):
+    def __init__(self, ground_set: List[int], B: NDArray[int], B_range: Tuple[int, int]):
+        """
+        Define a new integer-lattice modular function f(x) = x @ w.
+        Subclasses must set the weight vector self.w. Since f(x + k * 1_e) = f(x) + k * w[e],
+        marginal gains and singleton values are computed analytically, but every
+        query still counts as an oracle call.
+        :param ground_set: ground set of f
+        :param B: upper bound of the integer lattice domain of f
+        """
+        super().__init__(ground_set, B, B_range)
+        self.w: NDArray[Any] = None
+
+    def arrays(self) -> Dict[str, NDArray[Any]]:
+        """
+        Return the upper bound vector B and the weights w.
+        """
+        return {'B': self.B, 'w': self.w}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, NDArray[Any]],
+                    B_range: Tuple[int, int]) -> 'ModularObjective':
+        """
+        Rebuild a modular function from B and w, without drawing new weights.
+        """
+        f = cls.__new__(cls)
+        ModularObjective.__init__(f, list(range(len(arrays['w']))), arrays['B'], B_range)
+        f.w = arrays['w']
+        return f
+
+    def value(self, x: Union[NDArray[int], SparseVector]) -> int:
+        """
+        Value oracle for the modular function. Sparse vectors are evaluated in O(nnz(x)).
+        """
+        super().value(x)
+
+        if isinstance(x, SparseVector):
+            return x.counts @ self.w[x.indices]
+
+        return x @ self.w
+
+    def value_batch(self, X: NDArray[(Any, Any), int]) -> NDArray[int]:
+        """
+        Batched value oracle for the modular function.
+        """
+        self._count_calls(len(X))
+        return X @ self.w
+
+    def value_batch_steps(self, x: NDArray[int], E: NDArray[int],
+                          K: Union[int, NDArray[int]]) -> NDArray[int]:
+        """
+        Batched value oracle for f(x + K[i] * 1_{E[i]}) = f(x) + K[i] * w[E[i]],
+        computed with a single dot product.
+        """
+        E = np.asarray(E)
+        self._count_calls(len(E))
+        return x @ self.w + K * self.w[E]
+
+    def value_singletons(self, K: Union[int, NDArray[int]] = 1) -> NDArray[int]:
+        """
+        Return f(K[e] * 1_e) = K[e] * w[e] for every e in the ground set.
+        """
+        self._count_calls(self.n)
+        return K * self.w
+
+    def incremental(self, x: Union[None, NDArray[int]] = None) -> IncrementalOracle:
+        """
+        Return a stateful value oracle that answers f(x + k * 1_e) queries in O(1).
+        :param x: initial committed vector. If None, x starts from the zero vector
+        """
+        return ModularOracle(self, x)
+
+
+class ModularOracle(IncrementalOracle):
+    def __init__(self, f: ModularObjective, x: Union[None, NDArray[int]] = None):
+        """
+        Incremental value oracle for a modular function, which keeps f(x) as a running scalar.
+        :param f: modular objective
+        :param x: initial committed vector. If None, x starts from the zero vector
+        """
+        super().__init__(f, x)
+
+    def value_step(self, e: int, k: int) -> int:
+        """
+        Value oracle for f(x + k * 1_e) = f(x) + k * w[e] in O(1).
+        """
+        self.f._count_calls()
+        return self._value + k * self.f.w[e]
+
+    def value_steps(self, E: NDArray[int],
+                    K: Union[int, NDArray[int]]) -> NDArray[(Any, ), int]:
+        """
+        Batched value oracle for f(x + K[i] * 1_{E[i]}) in O(|E|).
+        """
+        E = np.asarray(E)
+        self.f._count_calls(len(E))
+        return self._value + K * self.f.w[E]
+
+    def commit(self, e: int, k: int, value: int):
+        """
+        Commit the step x <- x + k * 1_e, updating f(x) by k * w[e].
+        """
+        self._x[e] += k
+        self._value += k * self.f.w[e]
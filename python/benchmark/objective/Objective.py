@@ -1,6 +1,15 @@
+import numpy as np
 from abc import ABC
-from typing import List, Tuple
+from contextlib import AbstractContextManager, nullcontext
+from typing import Any, Callable, Dict, List, Tuple, Union
 from nptyping import NDArray
+from ..anytime import AnytimeBudget
+from .IncrementalOracle import IncrementalOracle
+from .SparseVector import SparseVector
+
+
+# call_site() is a no-op unless f is instrumented, hence a single shared context is enough
+_NULL_CALL_SITE = nullcontext()
 
 
 class Objective(ABC):
@@ -15,9 +24,23 @@ class Objective(ABC):
         self._B = B
         self._B_range = B_range
 
+        # smallest signed integer type that can hold any vector of the lattice domain
+        self._dtype = np.promote_types(np.min_scalar_type(int(np.max(B))), np.int8)
+
         # keep track of the number of oracle calls
         self._n_calls = 0
 
+        # keep track of the number of oracle round trips, i.e. of the single and
+        # batched oracle invocations
+        self._n_rounds = 0
+
+        # keep track of the objective-specific work performed by the oracle calls,
+        # e.g. the number of edges touched
+        self._n_work = 0
+
+        # optional anytime budget that the maximizers check at their checkpoints
+        self._budget: Union[None, AnytimeBudget] = None
+
     @property
     def V(self) -> List[int]:
         """
@@ -46,6 +69,25 @@ class Objective(ABC):
         """
         return self._n
 
+    @property
+    def dtype(self) -> np.dtype:
+        """
+        Return the smallest integer type of the dense vectors in the lattice domain.
+        """
+        return self._dtype
+
+    def zeros(self) -> NDArray[int]:
+        """
+        Return the dense zero vector of the lattice domain.
+        """
+        return np.zeros((self.n, ), dtype=self._dtype)
+
+    def dense(self, x: Union[NDArray[int], SparseVector]) -> NDArray[int]:
+        """
+        Return the dense representation of x, which is either a dense or a sparse vector.
+        """
+        return x.to_dense(self._dtype) if isinstance(x, SparseVector) else x
+
     @property
     def n_calls(self) -> int:
         """
@@ -53,19 +95,180 @@ class Objective(ABC):
         """
         return self._n_calls
 
-    def value(self, x: NDArray[int]) -> int:
+    @property
+    def n_rounds(self) -> int:
+        """
+        Return the number of oracle round trips. A batched oracle call that evaluates
+        f at several points counts as a single round trip.
+        """
+        return self._n_rounds
+
+    @property
+    def n_evals(self) -> int:
+        """
+        Return the number of oracle calls that actually evaluated f.
+        It differs from n_calls only for memoizing objectives.
+        """
+        return self._n_calls
+
+    @property
+    def n_hits(self) -> int:
+        """
+        Return the number of oracle calls answered by a cache.
+        """
+        return 0
+
+    @property
+    def n_work(self) -> int:
+        """
+        Return the objective-specific work performed by the oracle calls,
+        e.g. the number of edges touched. It's 0 for objectives that don't track it.
+        """
+        return self._n_work
+
+    def _count_calls(self, k: int = 1, rounds: int = 1):
+        """
+        Increment the number of oracle calls by k, performed in the given number of round trips.
+        """
+        self._n_calls += k
+
+        if k > 0:
+            self._n_rounds += rounds
+
+    def _count_work(self, k: int):
+        """
+        Increment the objective-specific work counter by k.
+        """
+        self._n_work += k
+
+    def call_site(self, name: str) -> AbstractContextManager:
+        """
+        Return a context manager that attributes the oracle calls performed within it
+        to the call site name. It's a no-op unless f is instrumented.
+        :param name: name of the call site, e.g. 'binary_search'
+        """
+        return _NULL_CALL_SITE
+
+    def current_call_site(self) -> Union[None, str]:
+        """
+        Return the call site the oracle calls are currently attributed to, or None
+        unless f is instrumented. Worker processes run their oracle calls in it.
+        """
+        return None
+
+    def _pop_site_metrics(self) -> Dict[str, Any]:
+        """
+        Return the per-call-site oracle metrics recorded so far and clear them, so that
+        a worker process can send back the metrics of its own oracle calls.
+        It returns an empty dictionary unless f is instrumented.
+        """
+        return dict()
+
+    def _merge_site_metrics(self, sites: Dict[str, Any]):
+        """
+        Add the per-call-site oracle metrics recorded by a worker process.
+        It's a no-op unless f is instrumented.
+        """
+        pass
+
+    def record_group(self, name: str, n_calls: int, n_rounds: int):
+        """
+        Report the oracle calls performed by a named group of queries, e.g. by a shard of
+        a partitioned algorithm, possibly in a worker process. It's a no-op unless f is
+        instrumented.
+        :param name: name of the group, e.g. 'shard_0'
+        :param n_calls: number of oracle calls of the group
+        :param n_rounds: number of oracle round trips of the group
+        """
+        pass
+
+    def set_budget(self, budget: Union[None, AnytimeBudget]):
+        """
+        Attach the anytime budget of the runs of the maximizers on f, or detach it if None.
+        """
+        self._budget = budget
+
+    def checkpoint(self, value: Union[float, Callable[[], float]]) -> bool:
+        """
+        Report the value of the current feasible solution of a maximizer to the anytime
+        budget. It's a no-op returning False unless a budget is attached.
+        :param value: f(x) of the current solution x, or a thunk that computes it, which is
+                      only called when a budget is attached
+        :return: True iff the budget ran out, in which case the maximizer should return x
+        """
+        if self._budget is None:
+            return False
+
+        return self._budget.checkpoint(self.n_calls, value)
+
+    def value(self, x: Union[NDArray[int], SparseVector]) -> int:
         """
         Value oracle for the submodular problem.
-        :param x: subset of the ground set
+        :param x: vector of the lattice domain, either dense or sparse
         :return: value oracle for S in the submodular problem
         """
-        self._n_calls += 1
-        
-        if self._n_calls % 10000 == 0:
-            print(f'Oracle calls: {self._n_calls}')
-
+        self._count_calls()
         return None
 
+    def value_batch(self, X: NDArray[(Any, Any), int]) -> NDArray[float]:
+        """
+        Batched value oracle. Every row of X counts as a separate oracle call.
+        Objectives should override this method with a vectorized implementation,
+        the default one simply calls self.value once per row.
+        :param X: (m, n) matrix whose rows are the candidate vectors
+        :return: the m-dimensional vector (f(X[0]), ..., f(X[m - 1]))
+        """
+        return np.array([self.value(x) for x in X])
+
+    def value_batch_steps(self, x: NDArray[int], E: NDArray[int],
+                          K: Union[int, NDArray[int]]) -> NDArray[float]:
+        """
+        Batched value oracle for f(x + K[i] * 1_{E[i]}) for each step (E[i], K[i]).
+        :param x: base vector
+        :param E: coordinates of the steps
+        :param K: number of copies added in each step, either a scalar or one per step
+        :return: the vector (f(x + K[0] * 1_{E[0]}), ..., f(x + K[m - 1] * 1_{E[m - 1]}))
+        """
+        E = np.asarray(E)
+        X = np.tile(x, (len(E), 1))
+        X[np.arange(len(E)), E] += K
+        return self.value_batch(X)
+
+    def value_singletons(self, K: Union[int, NDArray[int]] = 1) -> NDArray[float]:
+        """
+        Return f(K[e] * 1_e) for every e in the ground set. Every singleton counts
+        as a separate oracle call.
+        :param K: number of copies of each element, either a scalar or one per element
+        :return: the vector (f(K[0] * 1_0), ..., f(K[n - 1] * 1_{n - 1}))
+        """
+        return self.incremental().value_steps(np.arange(self.n), K)
+
+    def incremental(self, x: Union[None, NDArray[int]] = None) -> IncrementalOracle:
+        """
+        Return a stateful value oracle that answers f(x + k * 1_e) queries w.r.t.
+        a committed vector x.
+        :param x: initial committed vector. If None, x starts from the zero vector
+        """
+        return IncrementalOracle(self, x)
+
+    def arrays(self) -> Dict[str, NDArray[Any]]:
+        """
+        Return the arrays that fully describe f, so that f can be stored on disk and
+        rebuilt with from_arrays(). Objectives that can't be stored raise NotImplementedError.
+        """
+        raise NotImplementedError(f'{type(self).__name__} cannot be stored')
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, NDArray[Any]],
+                    B_range: Tuple[int, int]) -> 'Objective':
+        """
+        Rebuild an objective from the arrays returned by arrays(). The arrays may be
+        read-only memory-mapped files, so f must never modify them in place.
+        :param arrays: arrays returned by arrays()
+        :param B_range: range of the upper bound vector of the integer lattice domain
+        """
+        raise NotImplementedError(f'{cls.__name__} cannot be stored')
+
     def marginal_gain(self, x: NDArray[int], y: NDArray[int]) -> int:
         """
         Value oracle for f(x | y) := f(x + y) - f(y)
@@ -77,3 +280,5 @@ class Objective(ABC):
         Reset the number of oracle calls to zero.
         """
         self._n_calls = 0
+        self._n_rounds = 0
+        self._n_work = 0
@@ -0,0 +1,183 @@
+import numpy as np
+from contextlib import AbstractContextManager
+from typing import Any, Callable, Dict, Union
+from nptyping import NDArray
+from .Objective import Objective
+from .IncrementalOracle import IncrementalOracle
+from .SparseVector import SparseVector
+
+
+class RestrictedObjective(Objective):
+    def __init__(self, f: Objective, coords: NDArray[int]):
+        """
+        View of an integer-lattice submodular function f restricted to the coordinates
+        in coords, i.e. g(y) = f(x) where x[coords[i]] = y[i] and x is 0 elsewhere.
+        The arrays of f are shared, not copied, and oracle calls are counted by f.
+        :param f: integer-lattice submodular function to restrict
+        :param coords: coordinates of f that g is defined on
+        """
+        self.coords: NDArray[int] = np.asarray(coords, dtype=int)
+        super().__init__(list(range(len(self.coords))), f.B[self.coords], f.B_range)
+        self.f = f
+
+    @property
+    def n_calls(self) -> int:
+        """
+        Return the number of oracle calls of f
+        """
+        return self.f.n_calls
+
+    @property
+    def n_rounds(self) -> int:
+        """
+        Return the number of oracle round trips of f
+        """
+        return self.f.n_rounds
+
+    @property
+    def n_evals(self) -> int:
+        """
+        Return the number of oracle calls that actually evaluated f
+        """
+        return self.f.n_evals
+
+    @property
+    def n_hits(self) -> int:
+        """
+        Return the number of oracle calls of f answered by a cache
+        """
+        return self.f.n_hits
+
+    @property
+    def n_work(self) -> int:
+        """
+        Return the objective-specific work performed by f
+        """
+        return self.f.n_work
+
+    def _count_calls(self, k: int = 1, rounds: int = 1):
+        """
+        Increment the number of oracle calls and round trips of f.
+        """
+        self.f._count_calls(k, rounds)
+
+    def call_site(self, name: str) -> AbstractContextManager:
+        """
+        Attribute the oracle calls performed within the returned context to name.
+        """
+        return self.f.call_site(name)
+
+    def current_call_site(self) -> Union[None, str]:
+        """
+        Return the call site the oracle calls of f are currently attributed to.
+        """
+        return self.f.current_call_site()
+
+    def _pop_site_metrics(self) -> Dict[str, Any]:
+        """
+        Return and clear the per-call-site oracle metrics of f.
+        """
+        return self.f._pop_site_metrics()
+
+    def _merge_site_metrics(self, sites: Dict[str, Any]):
+        """
+        Add the per-call-site oracle metrics recorded by a worker process to f.
+        """
+        self.f._merge_site_metrics(sites)
+
+    def record_group(self, name: str, n_calls: int, n_rounds: int):
+        """
+        Report the oracle calls performed by the group name to f.
+        """
+        self.f.record_group(name, n_calls, n_rounds)
+
+    def checkpoint(self, value: Union[float, Callable[[], float]]) -> bool:
+        """
+        Report the value of the current solution to the anytime budget of f.
+        """
+        return self.f.checkpoint(value)
+
+    def embed(self, y: Union[NDArray[int], SparseVector]) -> Union[NDArray[int], SparseVector]:
+        """
+        Return the vector x of the lattice domain of f such that x[coords] = y.
+        """
+        if isinstance(y, SparseVector):
+            return SparseVector(self.f.n, self.coords[y.indices], y.counts)
+
+        x = self.f.zeros()
+        x[self.coords] = y
+        return x
+
+    def value(self, y: Union[NDArray[int], SparseVector]) -> float:
+        """
+        Value oracle for f(x), where x[coords] = y.
+        """
+        return self.f.value(self.embed(y))
+
+    def value_batch(self, Y: NDArray[(Any, Any), int]) -> NDArray[float]:
+        """
+        Batched value oracle for every row of Y.
+        """
+        X = np.zeros((len(Y), self.f.n), dtype=self.f.dtype)
+        X[:, self.coords] = Y
+        return self.f.value_batch(X)
+
+    def value_batch_steps(self, y: NDArray[int], E: NDArray[int],
+                          K: Union[int, NDArray[int]]) -> NDArray[float]:
+        """
+        Batched value oracle for g(y + K[i] * 1_{E[i]}) for each step (E[i], K[i]).
+        """
+        return self.f.value_batch_steps(self.embed(y), self.coords[np.asarray(E, dtype=int)], K)
+
+    def incremental(self, y: Union[None, NDArray[int]] = None) -> IncrementalOracle:
+        """
+        Return a stateful value oracle backed by the incremental oracle of f.
+        """
+        return RestrictedOracle(self, y)
+
+    def reset(self):
+        """
+        Reset the state of the view only. The counters, cache and metrics belong to f,
+        which is shared with the other views, and is reset by its owner.
+        """
+        super().reset()
+
+
+class RestrictedOracle(IncrementalOracle):
+    def __init__(self, f: RestrictedObjective, y: Union[None, NDArray[int]] = None):
+        """
+        Incremental value oracle of a restricted objective, which maps every step
+        (e, k) to the step (coords[e], k) of the incremental oracle of the wrapped objective.
+        :param f: restricted objective
+        :param y: initial committed vector. If None, y starts from the zero vector
+        """
+        self.f = f
+        self._oracle = f.f.incremental(None if y is None else f.embed(f.dense(y)))
+        self._x = f.zeros() if y is None else np.array(f.dense(y), dtype=f.dtype)
+
+    @property
+    def value(self) -> float:
+        """
+        Return g(y) for the committed vector y.
+        """
+        return self._oracle.value
+
+    def value_step(self, e: int, k: int) -> float:
+        """
+        Value oracle for g(y + k * 1_e).
+        """
+        return self._oracle.value_step(self.f.coords[e], k)
+
+    def value_steps(self, E: NDArray[int],
+                    K: Union[int, NDArray[int]]) -> NDArray[(Any, ), float]:
+        """
+        Batched value oracle for g(y + K[i] * 1_{E[i]}) for each step (E[i], K[i]).
+        """
+        return self._oracle.value_steps(self.f.coords[np.asarray(E, dtype=int)], K)
+
+    def commit(self, e: int, k: int, value: float):
+        """
+        Commit the step y <- y + k * 1_e.
+        """
+        self._x[e] += k
+        self._oracle.commit(self.f.coords[e], k, value)
@@ -0,0 +1,53 @@
+import numpy as np
+from typing import Union
+from nptyping import NDArray
+
+
+class SparseVector(object):
+    def __init__(self, n: int, indices: NDArray[int], counts: NDArray[int]):
+        """
+        Sparse representation of an n-dimensional integer vector x, where
+        x[indices[i]] = counts[i] and every other coordinate is 0.
+        It's meant for the regime where x has few non-zero coordinates w.r.t. n,
+        so that objectives only touch the coordinates that are actually set.
+        It's never densified implicitly: use to_dense() or Objective.dense() instead.
+        :param n: dimension of the vector
+        :param indices: distinct coordinates of the non-zero entries
+        :param counts: values of the non-zero entries
+        """
+        self.n = n
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.counts = np.asarray(counts)
+
+    @classmethod
+    def from_dense(cls, x: NDArray[int]) -> 'SparseVector':
+        """
+        Return the sparse representation of the dense vector x.
+        """
+        indices = np.flatnonzero(x)
+        return cls(len(x), indices, x[indices])
+
+    @classmethod
+    def singleton(cls, n: int, e: int, k: int = 1) -> 'SparseVector':
+        """
+        Return the sparse representation of k * 1_e.
+        """
+        return cls(n, (e, ), (k, ))
+
+    @property
+    def nnz(self) -> int:
+        """
+        Return the number of non-zero entries
+        """
+        return len(self.indices)
+
+    def to_dense(self, dtype: Union[type, np.dtype] = np.int64) -> NDArray[int]:
+        """
+        Return the dense representation of the vector.
+        """
+        x = np.zeros((self.n, ), dtype=dtype)
+        x[self.indices] = self.counts
+        return x
+
+    def __len__(self) -> int:
+        return self.n
@@ -1,6 +1,12 @@
 from .Objective import Objective
+from .IncrementalOracle import IncrementalOracle
+from .SparseVector import SparseVector
+from .ModularObjective import ModularObjective
 from .DemoMonotone import DemoMonotone
 from .DemoMonotoneSkewed import DemoMonotoneSkewed
 from .DemoNonMonotone import DemoNonMonotone
 from .FacilityLocation import FacilityLocation
 from .BudgetAllocation import BudgetAllocation
+from .CachedObjective import CachedObjective
+from .InstrumentedObjective import InstrumentedObjective
+from .RestrictedObjective import RestrictedObjective
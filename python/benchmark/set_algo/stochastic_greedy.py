@@ -24,15 +24,18 @@ def stochastic_greedy(rng: np.random.Generator, f: SetObjective,
     # prev_value keeps track of the value of f(A)
     prev_value = 0
 
+    # elements of V - A
+    active = utils.ActiveSet(f.V, n=f.n)
+
     while len(A) < r:
         # R is a random subset obtained by sampling s random elements
         # from V - A
-        sample_space = list(f.V - A)
-        R: NDArray[int] = rng.choice(sample_space, size=min(s, len(sample_space)), replace=False)
+        R: NDArray[int] = active.sample(rng, s)
         prev_value, marginal_gain, a = max((
             (candidate_value := f.value(A | {a}), candidate_value - prev_value, a)
             for a in R
         ), key=utils.snd)
         A.add(a)
+        active.remove(a)
 
     return A, prev_value
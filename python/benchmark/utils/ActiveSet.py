@@ -0,0 +1,70 @@
+import numpy as np
+from nptyping import NDArray
+from typing import Iterable
+
+
+class ActiveSet(object):
+    def __init__(self, elements: Iterable[int], n: int):
+        """
+        Set of active elements of {0, ..., n - 1}, e.g. the coordinates e such that x[e] < B[e].
+        The active elements are kept at the front of an array, and a position index allows
+        removing any of them in O(1) by swapping it with the last active element.
+        :param elements: initially active elements
+        :param n: size of the ground set
+        """
+        self._elements: NDArray[int] = np.array(list(elements), dtype=int)
+        self._size = len(self._elements)
+
+        # _position[e] is the index of e in _elements, or -1 if e is not active
+        self._position: NDArray[int] = np.full((n, ), -1, dtype=int)
+        self._position[self._elements] = np.arange(self._size)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, e: int) -> bool:
+        return self._position[e] >= 0
+
+    def remove(self, e: int):
+        """
+        Remove the active element e in O(1).
+        """
+        self._swap(self._position[e], self._size - 1)
+        self._position[e] = -1
+        self._size -= 1
+
+    def sample(self, rng: np.random.Generator, s: int) -> NDArray[int]:
+        """
+        Sample min(s, len(self)) active elements uniformly at random without replacement
+        in O(s), via a partial Fisher-Yates shuffle of the active elements.
+        The sampled elements are returned in random order.
+        :param rng: numpy random generator instance
+        :param s: sample size
+        """
+        s = min(s, self._size)
+
+        # the i-th sampled element is swapped in from a random position in [i, size)
+        swap_with = rng.integers(np.arange(s), self._size)
+        for i, j in enumerate(swap_with):
+            self._swap(i, j)
+
+        return self._elements[:s].copy()
+
+    def permutation(self, rng: np.random.Generator) -> NDArray[int]:
+        """
+        Return all the active elements in random order. The active elements are sorted
+        before being shuffled, so that the permutation only depends on the set of active
+        elements and on the state of rng.
+        :param rng: numpy random generator instance
+        """
+        V = np.sort(self._elements[:self._size])
+        rng.shuffle(V)
+        return V
+
+    def _swap(self, i: int, j: int):
+        """
+        Swap the elements at positions i and j, updating the position index.
+        """
+        e_i, e_j = self._elements[i], self._elements[j]
+        self._elements[i], self._elements[j] = e_j, e_i
+        self._position[e_j], self._position[e_i] = i, j
@@ -0,0 +1,112 @@
+import math
+import multiprocessing as mp
+import numpy as np
+from nptyping import NDArray
+from typing import Any, Dict, List, Tuple, Union
+from ..objective import Objective, IncrementalOracle
+from .binary_search import binary_search
+from .split_list import split_list
+
+
+# objective inherited by the worker processes when they are forked
+_worker_f: Objective = None
+
+
+def _init_worker(f: Objective):
+    global _worker_f
+    _worker_f = f
+
+
+def _binary_search_chunk(x: NDArray[int], theta: float, search_mode: str,
+                         steps: List[Tuple[int, int]], site: Union[None, str]
+                         ) -> Tuple[List[Union[None, Tuple[int, float]]], int, int, Dict[str, Any]]:
+    """
+    Run the binary searches of the given (e, k_max) steps w.r.t. x in a worker process,
+    attributing their oracle calls to the call site of the main process.
+    :return: the results of the binary searches, the number of oracle calls and
+             round trips they performed, and their per-call-site oracle metrics
+    """
+    with _worker_f.call_site(site):
+        oracle = _worker_f.incremental(x)
+
+        # only the binary searches are counted, not the commit of x
+        _worker_f._pop_site_metrics()
+        n_calls_start = _worker_f.n_calls
+        n_rounds_start = _worker_f.n_rounds
+
+        best_t_list = [
+            binary_search(oracle, e, list(range(1, k_max + 1)), theta=theta, mode=search_mode)
+            for e, k_max in steps
+        ]
+
+    return best_t_list, _worker_f.n_calls - n_calls_start, _worker_f.n_rounds - n_rounds_start, \
+        _worker_f._pop_site_metrics()
+
+
+class BinarySearchPool(object):
+    def __init__(self, f: Objective, n_workers: int = 1, search_mode: str = 'binary'):
+        """
+        Run independent binary searches w.r.t. the same committed vector x in a pool
+        of n_workers processes. The workers are forked once, so they share the
+        arrays of f with the main process copy-on-write instead of receiving f
+        with every task. With n_workers <= 1 the searches run in the main process.
+        The oracle calls performed by the workers, and their metrics if f is
+        instrumented, are added to the ones of f.
+        :param f: integer-lattice submodular function
+        :param n_workers: number of worker processes
+        :param search_mode: search mode of utils.binary_search
+        """
+        self.f = f
+        self.n_workers = n_workers
+        self.search_mode = search_mode
+        self._pool = None
+
+        if n_workers > 1:
+            self._pool = mp.get_context('fork').Pool(n_workers, initializer=_init_worker,
+                                                     initargs=(f, ))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Terminate the worker processes.
+        """
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def search(self, oracle: IncrementalOracle, steps: List[Tuple[int, int]],
+               theta: float) -> List[Union[None, Tuple[int, float]]]:
+        """
+        For every (e, k_max) step, find the maximum k in [1, k_max] such that
+        f(k * 1_e | x) >= k * theta, where x is the vector committed in oracle.
+        :param oracle: incremental value oracle of f
+        :param steps: (e, k_max) pairs to search
+        :param theta: threshold
+        :return: for every step, (k, f(x + k * 1_e)) or None, as in utils.binary_search
+        """
+        if self._pool is None or len(steps) < 2:
+            return [
+                binary_search(oracle, e, list(range(1, k_max + 1)), theta=theta,
+                              mode=self.search_mode)
+                for e, k_max in steps
+            ]
+
+        # one chunk of steps per worker
+        chunk_size = math.ceil(len(steps) / self.n_workers)
+        x = np.copy(oracle.x)
+        site = self.f.current_call_site()
+        args = [(x, theta, self.search_mode, chunk, site) for chunk in split_list(steps, chunk_size)]
+
+        best_t_list = []
+        for chunk_best_t_list, n_calls, n_rounds, sites in self._pool.starmap(_binary_search_chunk, args):
+            best_t_list.extend(chunk_best_t_list)
+            self.f._count_calls(n_calls, n_rounds)
+            self.f._merge_site_metrics(sites)
+
+        return best_t_list
@@ -0,0 +1,171 @@
+import math
+import multiprocessing as mp
+import numpy as np
+from nptyping import NDArray
+from typing import Any, Dict, List, Tuple, Union
+from ..metrics import merge_sites
+from ..objective import Objective, IncrementalOracle
+from .split_list import split_list
+
+
+# objective inherited by the worker processes when they are forked
+_worker_f: Objective = None
+
+
+def _init_worker(f: Objective):
+    global _worker_f
+    _worker_f = f
+
+
+def _value_steps_chunk(queries: List[Tuple[NDArray[int], NDArray[int], NDArray[int]]],
+                       count_x: bool = True, site: Union[None, str] = None
+                       ) -> Tuple[List[Tuple[float, NDArray[float]]], int, int, Dict[str, Any]]:
+    """
+    Evaluate the given (x, E, K) queries in a worker process, attributing their oracle
+    calls to the call site of the main process.
+    :param count_x: whether the evaluation of f(x) that commits x in the worker
+                    oracle is counted, or only the steps are
+    :param site: call site of the main process
+    :return: the values of the queries, the number of oracle calls and round trips
+             they performed, and their per-call-site oracle metrics
+    """
+    values_list = []
+    n_calls = 0
+    n_rounds = 0
+
+    # drop the metrics inherited from the main process
+    _worker_f._pop_site_metrics()
+    sites = dict()
+
+    with _worker_f.call_site(site):
+        for x, E, K in queries:
+            if count_x:
+                n_calls_start = _worker_f.n_calls
+                n_rounds_start = _worker_f.n_rounds
+                oracle = _worker_f.incremental(x)
+            else:
+                merge_sites(sites, _worker_f._pop_site_metrics())
+                oracle = _worker_f.incremental(x)
+                _worker_f._pop_site_metrics()
+                n_calls_start = _worker_f.n_calls
+                n_rounds_start = _worker_f.n_rounds
+
+            values_list.append((oracle.value, oracle.value_steps(E, K)))
+            n_calls += _worker_f.n_calls - n_calls_start
+            n_rounds += _worker_f.n_rounds - n_rounds_start
+
+    return values_list, n_calls, n_rounds, merge_sites(sites, _worker_f._pop_site_metrics())
+
+
+def _value_steps(f: Objective, x: NDArray[int], E: NDArray[int],
+                 K: Union[int, NDArray[int]]) -> Tuple[float, NDArray[float]]:
+    """
+    Return f(x) and f(x + K[i] * 1_{E[i]}) for every step (E[i], K[i]), using an incremental
+    oracle committed to x.
+    """
+    oracle = f.incremental(x)
+    return oracle.value, oracle.value_steps(E, K)
+
+
+class QueryPool(object):
+    def __init__(self, f: Objective, n_workers: int = 1):
+        """
+        Evaluate independent batched oracle queries f(x + K[i] * 1_{E[i]}) w.r.t. different
+        vectors x in a pool of n_workers processes. As in BinarySearchPool, the workers are forked once and
+        share the arrays of f copy-on-write. With n_workers <= 1 the queries are
+        evaluated in the main process. The oracle calls performed by the workers, and
+        their metrics if f is instrumented, are added to the ones of f.
+        :param f: integer-lattice submodular function
+        :param n_workers: number of worker processes
+        """
+        self.f = f
+        self.n_workers = n_workers
+        self._pool = None
+
+        if n_workers > 1:
+            self._pool = mp.get_context('fork').Pool(n_workers, initializer=_init_worker,
+                                                     initargs=(f, ))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Terminate the worker processes.
+        """
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def map_steps(self, queries: List[Tuple[NDArray[int], NDArray[int], Union[int, NDArray[int]]]]
+                  ) -> List[Tuple[float, NDArray[(Any, ), float]]]:
+        """
+        Evaluate every query (x, E, K) with an incremental oracle committed to x.
+        The queries don't depend on each other, so they are split among the workers.
+        :param queries: (x, E, K) queries
+        :return: for every query, f(x) and the vector of values f(x + K[i] * 1_{E[i]})
+        """
+        if self._pool is None or len(queries) < 2:
+            return [_value_steps(self.f, x, E, K) for x, E, K in queries]
+
+        return self._map_chunks(queries, count_x=True)
+
+    def _map_chunks(self, queries: List[Tuple[NDArray[int], NDArray[int], Union[int, NDArray[int]]]],
+                    count_x: bool) -> List[Tuple[float, NDArray[(Any, ), float]]]:
+        """
+        Split the queries among the workers and add the oracle calls they performed to f.
+        If count_x is False, the queries are the chunks of a single batched query, so the
+        concurrent round trips of the workers are counted once.
+        """
+        # one chunk of queries per worker
+        chunk_size = math.ceil(len(queries) / self.n_workers)
+        site = self.f.current_call_site()
+        args = [(chunk, count_x, site) for chunk in split_list(queries, chunk_size)]
+
+        values_list = []
+        n_calls_list = []
+        n_rounds_list = []
+        for chunk_values_list, n_calls, n_rounds, sites in self._pool.starmap(_value_steps_chunk, args):
+            values_list.extend(chunk_values_list)
+            n_calls_list.append(n_calls)
+            n_rounds_list.append(n_rounds)
+            self.f._merge_site_metrics(sites)
+
+        if count_x:
+            self.f._count_calls(sum(n_calls_list), sum(n_rounds_list))
+        else:
+            self.f._count_calls(sum(n_calls_list), max(n_rounds_list))
+
+        return values_list
+
+    def value_steps(self, oracle: IncrementalOracle, E: NDArray[int],
+                    K: Union[int, NDArray[int]]) -> NDArray[(Any, ), float]:
+        """
+        Evaluate oracle.value_steps(E, K) w.r.t. the vector x committed in oracle,
+        splitting the steps among the workers. Every worker commits x in its own
+        oracle, but only the steps are counted, so that the oracle calls and rounds
+        don't depend on the number of workers.
+        """
+        if self._pool is None:
+            return oracle.value_steps(E, K)
+
+        E = np.asarray(E)
+        K = np.broadcast_to(K, E.shape)
+        x = np.copy(oracle.x)
+
+        # one chunk of steps per worker
+        chunk_size = max(math.ceil(len(E) / self.n_workers), 1)
+        queries = [
+            (x, E[i:i + chunk_size], K[i:i + chunk_size])
+            for i in range(0, len(E), chunk_size)
+        ]
+
+        if len(queries) < 2:
+            return oracle.value_steps(E, K)
+
+        values_list = self._map_chunks(queries, count_x=False)
+        return np.concatenate([np.empty(0), *(values for _, values in values_list)])
@@ -9,6 +9,9 @@ from .prod import prod
 from .compute_sample_size import compute_sample_size
 from .binary_search import binary_search
 from .split_list import split_list
+from .BinarySearchPool import BinarySearchPool
+from .ActiveSet import ActiveSet
+from .QueryPool import QueryPool
 
 # numpy vector coordinate-wise utils
 from . import coord_wise
@@ -1,43 +1,105 @@
+import numpy as np
 from typing import List, Union, Tuple
-from nptyping import NDArray
-from ..objective import Objective
+from ..objective import IncrementalOracle
 
 
-def binary_search(f: Objective, k_range: List[int], one_e: NDArray[int],
-                  x: NDArray[int], prev_value: float,
-                  theta: float) -> Union[None, Tuple[int, NDArray[int], float]]:
+def binary_search(f: IncrementalOracle, e: int, k_range: List[int],
+                  theta: float, mode: str = 'binary',
+                  n_probes: int = 8) -> Union[None, Tuple[int, float]]:
     """
     Iterative binary search for the maximum k in k_range such that
-    f.marginal_gain(k * one_e, x) >= k * theta.
-    :param f: monotone integer lattice submodular function
+    f(k * 1_e | x) >= k * theta, where x is the vector committed in f.
+    In 'binary' mode every probe is a separate oracle call. In 'k-ary' mode every round
+    evaluates n_probes evenly spaced k with a single batched oracle call, splitting the
+    search interval in n_probes + 1 parts. In 'galloping' mode the first round evaluates
+    the exponential grid k_range[0], k_range[1], k_range[3], k_range[7], ... up to the
+    last k, and the bracketed interval is then refined as in 'k-ary' mode.
+    :param f: incremental value oracle of a monotone integer lattice submodular function
+    :param e: coordinate of the steps to search
     :param k_range: sorted range of k to search
-    :param one_e: n-dimensional characteristic vector of e
-    :param x: previous iterate
-    :param prev_value: value of f(x)
     :param theta: threshold
-    :return: (k, x + k * one_e, f(x + k * one_e)) or None of no k such that
-             f.marginal_gain(k * one_e, x) >= k * theta could be found.
+    :param mode: search mode, either 'binary', 'k-ary' or 'galloping'
+    :param n_probes: number of k evaluated in each round of the 'k-ary' and 'galloping' modes
+    :return: (k, f(x + k * 1_e)) or None of no k such that
+             f(k * 1_e | x) >= k * theta could be found.
     """
     if len(k_range) == 0:
         return None
 
+    if mode != 'binary':
+        return multi_probe_search(f, e, k_range, theta, galloping=(mode == 'galloping'),
+                                  n_probes=n_probes)
+
     k_max = k_range[-1]
     k_min = k_range[0]
+    prev_value = f.value
     best_t = None
 
     while k_min <= k_max:
         candidate_k = k_max - (k_max - k_min) // 2
 
-        candidate_x = x + candidate_k * one_e
-        candidate_value = f.value(candidate_x)
+        with f.call_site('binary_search'):
+            candidate_value = f.value_step(e, candidate_k)
         marginal_gain = candidate_value - prev_value
 
         if marginal_gain >= candidate_k * theta:
             k_min = candidate_k + 1
 
             if best_t is None or best_t[0] < candidate_k:
-                best_t = (candidate_k, candidate_x, candidate_value)
+                best_t = (candidate_k, candidate_value)
         else:
             k_max = candidate_k - 1
-    
+
+    return best_t
+
+
+def multi_probe_search(f: IncrementalOracle, e: int, k_range: List[int], theta: float,
+                       galloping: bool, n_probes: int) -> Union[None, Tuple[int, float]]:
+    """
+    Search for the maximum k in k_range such that f(k * 1_e | x) >= k * theta, evaluating
+    several k per round with a single batched oracle call. See binary_search.
+    """
+    k_range = np.asarray(k_range)
+    prev_value = f.value
+    best_t = None
+
+    # the search interval is [low, high], as indexes of k_range
+    low, high = 0, len(k_range) - 1
+
+    if galloping:
+        # exponential grid of indexes 0, 1, 3, 7, ..., always including the last one
+        probes = np.unique(np.minimum(2 ** np.arange(int(high).bit_length() + 1) - 1, high))
+    else:
+        probes = None
+
+    while low <= high:
+        if probes is None:
+            size = high - low + 1
+
+            if size <= n_probes:
+                probes = np.arange(low, high + 1)
+            else:
+                probes = low + (np.arange(1, n_probes + 1) * size) // (n_probes + 1)
+
+        candidate_ks = k_range[probes]
+
+        with f.call_site('binary_search'):
+            candidate_values = f.value_steps(np.full(len(probes), e), candidate_ks)
+        marginal_gains = candidate_values - prev_value
+
+        feasible = np.flatnonzero(marginal_gains >= candidate_ks * theta)
+
+        if len(feasible) == 0:
+            high = probes[0] - 1
+        else:
+            # the largest feasible probe brackets the maximum k together with the next probe
+            j = feasible[-1]
+            best_t = (int(candidate_ks[j]), float(candidate_values[j]))
+
+            low = probes[j] + 1
+            if j + 1 < len(probes):
+                high = probes[j + 1] - 1
+
+        probes = None
+
     return best_t
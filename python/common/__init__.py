@@ -1,2 +1,3 @@
 from .read_csv import read_csv
+from .read_arrow import read_arrow
 from .to_csv import to_csv
@@ -0,0 +1,17 @@
+import pandas as pd
+import pyarrow.dataset as ds
+
+
+def read_arrow(dirpath: str, obj: str) -> pd.DataFrame:
+    """
+    Read the results of the objective obj from the Arrow dataset in dirpath, which is
+    partitioned by objective and algorithm as dirpath/obj=<obj>/algo=<algo>.
+    The algorithm of every row is in the 'algo' column. A run written more than once,
+    e.g. by a resumed benchmark, is only returned once, with its latest results.
+    """
+    dataset = ds.dataset(dirpath, format='ipc', partitioning='hive')
+    table = dataset.to_table(filter=ds.field('obj') == obj)
+    df = table.to_pandas().drop(columns=['obj'])
+
+    # the part files are read in the order in which they were written
+    return df.drop_duplicates(subset=['algo', 'n', 'b_low', 'b_high', 'r', 'i'], keep='last')
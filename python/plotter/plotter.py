@@ -23,13 +23,27 @@ def import_csvs_by_f_name(input_folder: str, f_name: str):
         ('r', np.int32),
         ('approx', np.float64),
         ('n_calls', np.int64),
-        ('time_ms', np.int64),
+        ('n_rounds', np.int64),
+        ('n_evals', np.int64),
+        ('n_hits', np.int64),
+        ('time_ms', np.float64),
+        ('cpu_ms', np.float64),
+        ('oracle_ms', np.float64),
+        ('overhead_ms', np.float64),
+        ('singleton_scan_ms', np.float64),
+        ('load_ms', np.float64),
+        ('peak_rss_mb', np.float64),
+        ('finished', bool),
     ])
     df_list = []
 
     for obj_algo_csv in glob(os.path.join(input_folder, f_name, '*.csv')):
         filename = os.path.splitext(os.path.basename(obj_algo_csv))[0]
 
+        # skip the sidecars of the benchmarks, e.g. <algo>.anytime.csv
+        if '.' in filename:
+            continue
+
         # find algorithm name
         algo = '-'.join(filename.split('-'))
 
@@ -44,6 +58,36 @@ def import_csvs_by_f_name(input_folder: str, f_name: str):
     return df
 
 
+def import_results_by_f_name(input_folder: str, f_name: str):
+    """
+    Import the typed results of f_name from the Arrow dataset in input_folder/arrow,
+    together with the CSV files of the runs that predate it. A run that is both in
+    the Arrow dataset and in a CSV file is only imported once, from the Arrow dataset.
+    """
+    arrow_folder = os.path.join(input_folder, 'arrow')
+
+    if not os.path.isdir(os.path.join(arrow_folder, f'obj={f_name}')):
+        return import_csvs_by_f_name(input_folder, f_name)
+
+    df = common.read_arrow(arrow_folder, obj=f_name)
+
+    # CSV files of the algorithms, without the sidecars of the benchmarks
+    csvs = [
+        csv for csv in glob(os.path.join(input_folder, f_name, '*.csv'))
+        if '.' not in os.path.splitext(os.path.basename(csv))[0]
+    ]
+
+    if len(csvs) > 0:
+        csv_df = import_csvs_by_f_name(input_folder, f_name)
+        df = pd.concat([df, csv_df], ignore_index=True)
+        df.drop_duplicates(subset=['algo', 'n', 'b_low', 'b_high', 'r', 'i'], keep='first', inplace=True)
+
+    df.attrs['obj'] = f_name
+    df.sort_values(by=['algo', 'n', 'r', 'b_low', 'b_high', 'i'], inplace=True)
+
+    return df
+
+
 @hydra.main(config_path="../conf", config_name="config")
 def plotter(cfg: DictConfig) -> None:
 
@@ -54,7 +98,7 @@ def plotter(cfg: DictConfig) -> None:
     #  budget_allocation  #
     #######################
 
-    budget_allocation_df = import_csvs_by_f_name(f'{basedir}/out/', f_name='budget_allocation')
+    budget_allocation_df = import_results_by_f_name(f'{basedir}/out/', f_name='budget_allocation')
     df = budget_allocation_df
     plots_folder = f'{basedir}/out/{df.attrs["obj"]}/plots'
     Path(plots_folder).mkdir(parents=True, exist_ok=True)
@@ -64,7 +108,7 @@ def plotter(cfg: DictConfig) -> None:
     #  demo_monotone  #
     ###################
 
-    demo_monotone_df = import_csvs_by_f_name(f'{basedir}/out/', f_name='demo_monotone')
+    demo_monotone_df = import_results_by_f_name(f'{basedir}/out/', f_name='demo_monotone')
     df = demo_monotone_df
     plots_folder = f'{basedir}/out/{df.attrs["obj"]}/plots'
     Path(plots_folder).mkdir(parents=True, exist_ok=True)
@@ -74,7 +118,7 @@ def plotter(cfg: DictConfig) -> None:
     #  demo_monotone_skewed  #
     ##########################
 
-    demo_monotone_skewed_df = import_csvs_by_f_name(f'{basedir}/out/', f_name='demo_monotone_skewed')
+    demo_monotone_skewed_df = import_results_by_f_name(f'{basedir}/out/', f_name='demo_monotone_skewed')
     df = demo_monotone_skewed_df
     plots_folder = f'{basedir}/out/{df.attrs["obj"]}/plots'
     Path(plots_folder).mkdir(parents=True, exist_ok=True)
@@ -84,7 +128,7 @@ def plotter(cfg: DictConfig) -> None:
     #  demo_non_monotone  #
     #######################
 
-    demo_non_monotone_df = import_csvs_by_f_name(f'{basedir}/out/', f_name='demo_non_monotone')
+    demo_non_monotone_df = import_results_by_f_name(f'{basedir}/out/', f_name='demo_non_monotone')
     df = demo_non_monotone_df
     plots_folder = f'{basedir}/out/{df.attrs["obj"]}/plots'
     Path(plots_folder).mkdir(parents=True, exist_ok=True)
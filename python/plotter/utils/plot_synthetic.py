@@ -32,6 +32,24 @@ def plot_synthetic(df: pd.DataFrame, plots_folder: str):
         boxplot_by_algo(data=data, y='n_calls', ylabel='Oracle Calls', ax=ax,
                         title=title, plots_folder=plots_folder, filename=filename)
 
+        #######################
+        #  Algorithm vs Time  #
+        #######################
+        title = f'Algorithm vs Time (n: {n}; B: {[b_low, b_high]}; r: {r})'
+        filename = f'algo_vs_time_boxplot-n_{n}-B_{b_low}_{b_high}-r_{r}'
+        boxplot_by_algo(data=data, y='time_ms', ylabel='Time (ms)', ax=ax,
+                        title=title, plots_folder=plots_folder, filename=filename)
+
+        ################################
+        #  Algorithm vs Overhead Time  #
+        ################################
+        # the time spent out of the oracle is only measured when runtime.metrics is set
+        if 'overhead_ms' in data and data['overhead_ms'].notna().any():
+            title = f'Algorithm vs Overhead Time (n: {n}; B: {[b_low, b_high]}; r: {r})'
+            filename = f'algo_vs_overhead_time_boxplot-n_{n}-B_{b_low}_{b_high}-r_{r}'
+            boxplot_by_algo(data=data, y='overhead_ms', ylabel='Non-Oracle Time (ms)', ax=ax,
+                            title=title, plots_folder=plots_folder, filename=filename)
+
     pairs = set(((n, r) for n, r, _ in sorted(set(generate_nbr()))))
     for n, r in pairs:
         data = df \
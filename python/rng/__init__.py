@@ -1,2 +1,3 @@
 from .rng import SEED
 from .rng import rng
+from .rng import stream_rng
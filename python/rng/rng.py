@@ -1,7 +1,21 @@
+import zlib
 import numpy as np
+from typing import Union
 
 
 SEED = 2022
 
 # numpy random generator instance
 rng: np.random.Generator = np.random.default_rng(SEED)
+
+
+def stream_rng(*key: Union[int, str]) -> np.random.Generator:
+    """
+    Return the random generator of the stream identified by key, e.g.
+    (objective, instance, algorithm, replicate). The stream is spawned from the root
+    SeedSequence(SEED) via its spawn key, so it doesn't depend on the order in which
+    the streams are created, nor on the process that creates them.
+    :param key: integers or strings, which are mapped to their CRC-32 checksum
+    """
+    spawn_key = tuple(zlib.crc32(k.encode()) if isinstance(k, str) else int(k) for k in key)
+    return np.random.default_rng(np.random.SeedSequence(SEED, spawn_key=spawn_key))